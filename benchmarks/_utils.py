@@ -0,0 +1,62 @@
+import statistics
+import time
+
+
+def measure(function, number=1000, repeat=5):
+    """
+    Run function `number` times, `repeat` times over, and return the median
+    time per call in microseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number * 1e6)
+    return statistics.median(timings)
+
+
+def report(title, results):
+    """
+    Print a table of (name, microseconds) rows, with the speedup relative to
+    the first row.
+    """
+    print(title)
+    baseline = results[0][1]
+    for name, elapsed in results:
+        print(f"  {name:<32} {elapsed:>10.2f} us  x{baseline / elapsed:.2f}")
+
+
+def report_memory(title, results):
+    """
+    Print a table of (name, bytes) rows, relative to the first row.
+    """
+    print(title)
+    baseline = results[0][1]
+    for name, size in results:
+        print(f"  {name:<32} {size / 1024:>10.1f} KiB  x{size / baseline:.2f}")
+
+
+def measure_latencies(function, number=1000, warmup=10):
+    """
+    Call function `number` times after `warmup` calls, and return the
+    throughput and latency percentiles in microseconds.
+    """
+    for _ in range(warmup):
+        function()
+
+    timings = []
+    for _ in range(number):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    timings.sort()
+    return {
+        "number": number,
+        "ops_per_sec": number / (sum(timings) / 1e6),
+        "mean_us": statistics.mean(timings),
+        "p50_us": timings[int(number * 0.50)],
+        "p90_us": timings[int(number * 0.90)],
+        "p99_us": timings[min(int(number * 0.99), number - 1)],
+    }
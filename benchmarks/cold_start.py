@@ -0,0 +1,186 @@
+"""
+Cold start benchmark of the pyverless entry points.
+
+Each scenario runs in fresh interpreters, timing the imports and first
+invocation pyverless is responsible for. Medians are reported along with the
+packages taking the most import time (from `python -X importtime`).
+
+Run from the repository root with:
+
+    python -m benchmarks.cold_start [--runs N] [--save results.json]
+    python -m benchmarks.cold_start --baseline results.json --threshold 0.2
+
+With a baseline, the exit status is 1 when a scenario median is more than
+threshold (a fraction) slower than in the baseline.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+TESTS = os.path.join(ROOT, "tests")
+
+CONTEXT = (
+    "from types import SimpleNamespace\n"
+    "context = SimpleNamespace(aws_request_id='cold-start', "
+    "get_remaining_time_in_millis=lambda: 3000)\n"
+)
+
+
+class Scenario(NamedTuple):
+    name: str
+    code: str
+    # PYVERLESS_SETTINGS, None for environ settings
+    settings: str = None
+
+
+SCENARIOS = [
+    Scenario("import pyverless.handlers", "import pyverless.handlers"),
+    Scenario(
+        "import api_gateway_handler_standalone",
+        "import pyverless.api_gateway_handler.api_gateway_handler_standalone",
+    ),
+    Scenario("config from environ", "import pyverless.config"),
+    Scenario(
+        "config from module", "import pyverless.config", settings="config_test.settings"
+    ),
+    Scenario(
+        "config from yaml",
+        "import pyverless.config",
+        settings=os.path.join(TESTS, "config_test", "settings.yml"),
+    ),
+    Scenario(
+        "BaseHandler first invocation",
+        CONTEXT
+        + "from pyverless.handlers import BaseHandler\n"
+        "class Handler(BaseHandler):\n"
+        "    def perform_action(self):\n"
+        "        return {'ok': True}\n"
+        "Handler.as_handler()({}, context)\n",
+    ),
+    Scenario(
+        "EventsHandler first invocation",
+        CONTEXT
+        + "from pyverless.events_handler.events_handler import EventsHandler\n"
+        "class Handler(EventsHandler):\n"
+        "    def perform_action(self):\n"
+        "        return {'ok': True}\n"
+        "Handler.as_handler(logger_level='WARNING')({}, context)\n",
+    ),
+]
+
+
+def get_environ(scenario):
+    environ = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, TESTS]))
+    environ.pop("PYVERLESS_SETTINGS", None)
+    if scenario.settings:
+        environ["PYVERLESS_SETTINGS"] = scenario.settings
+    return environ
+
+
+def run(scenario):
+    """
+    Run the scenario in a fresh interpreter, returns its duration in ms.
+    """
+    code = (
+        "import time\n"
+        "_start = time.perf_counter()\n"
+        f"{scenario.code}\n"
+        "print((time.perf_counter() - _start) * 1000)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        env=get_environ(scenario),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def import_times(scenario):
+    """
+    Import time of the scenario per top level package, in ms, from the
+    `-X importtime` output of a fresh interpreter. Modules the interpreter
+    imports on startup are left out.
+    """
+    startup = set(parse_import_times(Scenario("startup", "pass")))
+    packages = defaultdict(float)
+    for module, elapsed in parse_import_times(scenario).items():
+        if module not in startup:
+            packages[module.split(".")[0]] += elapsed
+    return packages
+
+
+def parse_import_times(scenario):
+    """
+    Self import time of each module imported running the scenario, in ms.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", scenario.code],
+        env=get_environ(scenario),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        modules[module.strip()] = int(self_us) / 1000
+    return modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="runs per scenario")
+    parser.add_argument("--top", type=int, default=5, help="packages to list")
+    parser.add_argument("--save", help="write the medians to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of medians to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown fraction"
+    )
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    medians = {}
+    regressions = []
+    for scenario in SCENARIOS:
+        median = statistics.median(run(scenario) for _ in range(args.runs))
+        medians[scenario.name] = median
+
+        line = f"{scenario.name:<40} {median:>8.1f} ms"
+        if scenario.name in baseline:
+            change = median / baseline[scenario.name] - 1
+            line += f"  {change:+.0%}"
+            if change > args.threshold:
+                line += "  REGRESSION"
+                regressions.append(scenario.name)
+        print(line)
+
+        packages = import_times(scenario)
+        for package, elapsed in sorted(packages.items(), key=lambda item: -item[1])[
+            : args.top
+        ]:
+            print(f"    {package:<36} {elapsed:>8.1f} ms")
+
+    if args.save:
+        with open(args.save, "w") as save_file:
+            json.dump(medians, save_file, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
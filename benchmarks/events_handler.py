@@ -0,0 +1,76 @@
+"""
+Benchmark of the per invocation overhead of EventsHandler.as_handler handlers.
+
+Run from the repository root with:
+
+    python -m benchmarks.events_handler
+"""
+from logging import config
+from os import environ
+
+from pythonjsonlogger.jsonlogger import JsonFormatter
+
+from benchmarks._utils import measure, report
+from pyverless.events_handler.events_handler import EventsHandler
+from tests.utils.aws_events_creations import create_lambda_context
+
+
+def legacy_initialize_logger(logger_level="DEBUG", aws_request_id="default"):
+    """
+    Logging initialization as it was done on every invocation before
+    configure_logging: formatter class and dictConfig rebuilt each time.
+    """
+    environ["AWS_REQUEST_ID"] = aws_request_id
+
+    class CustomJsonFormatter(JsonFormatter):
+        pass
+
+    config.dictConfig(
+        {
+            "version": 1,
+            "disable_existing_loggers": False,
+            "loggers": {
+                "pyverless": {
+                    "handlers": ["handler_for_pyverless"],
+                    "level": logger_level,
+                    "propagate": False,
+                }
+            },
+            "handlers": {
+                "handler_for_pyverless": {
+                    "formatter": "formatter_for_pyverless",
+                    "class": "logging.StreamHandler",
+                    "level": logger_level,
+                }
+            },
+            "formatters": {"formatter_for_pyverless": {"()": CustomJsonFormatter}},
+        }
+    )
+
+
+class NoopHandler(EventsHandler):
+    def perform_action(self):
+        return None
+
+
+def main():
+    context = create_lambda_context()
+    handler = NoopHandler.as_handler(logger_level="WARNING")
+
+    def legacy_invocation():
+        legacy_initialize_logger(
+            logger_level="WARNING", aws_request_id=context.aws_request_id
+        )
+        NoopHandler().lambda_handler({}, context)
+
+    report(
+        "Warm invocation of a no-op EventsHandler",
+        [
+            ("logging initialized per call", measure(legacy_invocation, 2000)),
+            ("logging configured once", measure(lambda: handler({}, context), 2000)),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
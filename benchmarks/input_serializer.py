@@ -0,0 +1,166 @@
+"""
+Benchmark of pyverless.serialization.input_serializer on nested payloads.
+
+Run from the repository root with:
+
+    python -m benchmarks.input_serializer
+"""
+import random
+import tracemalloc
+
+from pyverless.serialization import input_serializer
+from benchmarks._utils import measure, report, report_memory
+
+
+class AddressSerializer(input_serializer.Serializer):
+    optional_fields = ["floor"]
+
+    street = input_serializer.StringSerializer()
+    number = input_serializer.IntegerSerializer()
+    floor = input_serializer.IntegerSerializer()
+    city = input_serializer.StringSerializer()
+
+
+class ItemSerializer(input_serializer.Serializer):
+    name = input_serializer.StringSerializer()
+    price = input_serializer.FloatSerializer()
+    quantity = input_serializer.IntegerSerializer()
+    gift = input_serializer.BooleanSerializer()
+
+
+class OrderSerializer(input_serializer.Serializer):
+    reference = input_serializer.StringSerializer()
+    address = AddressSerializer()
+    items = input_serializer.ListSerializer(items_serializer=ItemSerializer())
+
+
+class LegacyMixin:
+    """
+    Field lookup as it was done before field plans: walk dir() on every call.
+    """
+
+    def transform_data(self, input_data):
+        result = {}
+        for field_name in self._get_serializer_fields():
+            serializer = getattr(self, field_name)
+            try:
+                if field_name in input_data:
+                    result[field_name] = serializer.serialize(input_data[field_name])
+                else:
+                    if field_name not in self.optional_fields:
+                        raise input_serializer.SerializationError("Data is mandatory")
+            except Exception as ex:
+                raise input_serializer.SerializationError(
+                    f"Field: {field_name} Error: {str(ex)}"
+                )
+        return result
+
+    def _get_serializer_fields(self):
+        keys = [key for key in self.__dir__() if not key.startswith("_")]
+        return [
+            key
+            for key in keys
+            if isinstance(getattr(self, key), input_serializer.BaseSerializer)
+        ]
+
+
+class LegacyAddressSerializer(LegacyMixin, AddressSerializer):
+    pass
+
+
+class LegacyItemSerializer(LegacyMixin, ItemSerializer):
+    pass
+
+
+class LegacyOrderSerializer(LegacyMixin, OrderSerializer):
+    address = LegacyAddressSerializer()
+    items = input_serializer.ListSerializer(items_serializer=LegacyItemSerializer())
+
+
+class CodegenOrderSerializer(OrderSerializer):
+    codegen = True
+
+
+class SlottedItemSerializer(ItemSerializer):
+    slotted_output = True
+
+
+def build_payload(items=20):
+    return {
+        "reference": "ORD-0001",
+        "address": {"street": "Gran Via", "number": 1, "city": "Madrid"},
+        "items": [
+            {"name": f"item-{i}", "price": 9.99, "quantity": i, "gift": False}
+            for i in range(items)
+        ],
+    }
+
+
+def main():
+    payload = build_payload()
+    legacy = LegacyOrderSerializer()
+    planned = OrderSerializer()
+    generated = CodegenOrderSerializer()
+    assert legacy.serialize(payload) == planned.serialize(payload)
+    assert generated.serialize(payload) == planned.serialize(payload)
+
+    report(
+        "Nested payload (1 order, 20 items)",
+        [
+            ("dir() walk per call", measure(lambda: legacy.serialize(payload), 500)),
+            ("compiled field plan", measure(lambda: planned.serialize(payload), 500)),
+            ("codegen", measure(lambda: generated.serialize(payload), 500)),
+        ],
+    )
+
+    readings = [random.random() * 100 for _ in range(50000)]
+    item_serializer = input_serializer.FloatSerializer()
+    bulk = input_serializer.ListSerializer(items_serializer=item_serializer)
+    packed = input_serializer.ListSerializer(
+        items_serializer=input_serializer.FloatSerializer(nullable=False),
+        output="array",
+    )
+
+    report(
+        "List of 50k floats",
+        [
+            (
+                "serialize() per item",
+                measure(lambda: [item_serializer.serialize(r) for r in readings], 10),
+            ),
+            ("bulk path", measure(lambda: bulk.serialize(readings), 10)),
+            ("bulk path, array output", measure(lambda: packed.serialize(readings), 10)),
+        ],
+    )
+
+    items = build_payload(items=10000)["items"]
+    dict_serializer = ItemSerializer()
+    slotted_serializer = SlottedItemSerializer()
+    report_memory(
+        "Memory of 10k serialized items",
+        [
+            (
+                "dict output",
+                allocated(lambda: [dict_serializer.serialize(i) for i in items]),
+            ),
+            (
+                "slotted dataclass output",
+                allocated(lambda: [slotted_serializer.serialize(i) for i in items]),
+            ),
+        ],
+    )
+
+
+def allocated(function):
+    """
+    Return the bytes still allocated by the value returned by function.
+    """
+    tracemalloc.start()
+    result = function()  # noqa: F841
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+if __name__ == "__main__":
+    main()
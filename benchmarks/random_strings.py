@@ -0,0 +1,55 @@
+"""
+Benchmark of crypto.get_random_string against the implementation reseeding the
+random module on every call.
+
+Run from the repository root with:
+
+    python -m benchmarks.random_strings
+"""
+import hashlib
+import random
+import time
+
+from benchmarks._utils import measure, report
+from pyverless.config import settings
+from pyverless.crypto import RANDOM_STRING_CHARS, get_random_string, get_random_strings
+
+
+def legacy_get_random_string(length=12, allowed_chars=RANDOM_STRING_CHARS):
+    """
+    get_random_string as it was before drawing from os.urandom.
+    """
+    random.seed(
+        hashlib.sha256(
+            ('%s%s%s' % (random.getstate(), time.time(), settings.SECRET_KEY)).encode()
+        ).digest()
+    )
+    return ''.join(random.choice(allowed_chars) for i in range(length))
+
+
+def main():
+    report(
+        "A random string of 12 characters",
+        [
+            ("reseeding random", measure(legacy_get_random_string, 2000)),
+            ("os.urandom", measure(get_random_string, 2000)),
+        ],
+    )
+    report(
+        "10000 random strings of 12 characters",
+        [
+            (
+                "reseeding random",
+                measure(lambda: [legacy_get_random_string() for i in range(10000)], 1, 3),
+            ),
+            (
+                "os.urandom per string",
+                measure(lambda: [get_random_string() for i in range(10000)], 1, 3),
+            ),
+            ("os.urandom in bulk", measure(lambda: get_random_strings(10000), 1, 3)),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Benchmark of warm invocations: handlers, serializers and crypto.
+
+Everything runs in process against in-memory fake models, with the event
+factories of the test suite. Results (throughput and latency percentiles) are
+printed and can be written as JSON, to compare releases.
+
+Run from the repository root with:
+
+    python -m benchmarks.warm [--number N] [--output results.json] [--filter NAME]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from types import SimpleNamespace
+
+# Settings from the environment unless PYVERLESS_SETTINGS is set, JWTs need a key
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from benchmarks._utils import measure_latencies  # noqa: E402
+from pyverless import crypto, handlers, serializers  # noqa: E402
+from pyverless.api_gateway_handler.api_gateway_handler_standalone import (  # noqa: E402
+    ApiGatewayHandlerStandalone,
+)
+from pyverless.serialization import input_serializer  # noqa: E402
+from tests.utils.aws_events_creations import create_api_gateway_event  # noqa: E402
+
+CONTEXT = SimpleNamespace(
+    aws_request_id="warm", get_remaining_time_in_millis=lambda: 3000
+)
+
+
+class BookManager:
+    """
+    In-memory stand-in of an ORM manager.
+    """
+
+    def __init__(self):
+        self.books = {}
+
+    def get_or_none(self, uid):
+        return self.books.get(uid)
+
+    def __getitem__(self, position):
+        return list(self.books.values())[position]
+
+
+class Book:
+    objects = BookManager()
+
+    def __init__(self, title, pages, uid="book-new"):
+        self.uid = uid
+        self.title = title
+        self.pages = pages
+
+    def save(self):
+        Book.objects.books[self.uid] = self
+        return self
+
+    def delete(self):
+        # Kept, so the object can be deleted again by the next invocation
+        return None
+
+
+class BookSerializer(serializers.Serializer):
+    include = ["uid", "title", "pages"]
+
+
+class CreateBook(handlers.CreateHandler):
+    model = Book
+    required_body_keys = ["title", "pages"]
+
+
+class RetrieveBook(handlers.RetrieveHandler):
+    model = Book
+    serializer = BookSerializer
+
+
+class ListBooks(handlers.ListHandler):
+    model = Book
+    serializer = BookSerializer
+
+
+class UpdateBook(handlers.UpdateHandler):
+    model = Book
+    serializer = BookSerializer
+    optional_body_keys = ["title", "pages"]
+
+
+class DeleteBook(handlers.DeleteHandler):
+    model = Book
+
+
+class Hello(ApiGatewayHandlerStandalone):
+    def perform_action(self):
+        return {"message": f"hello {self.event_parsed.path}"}
+
+
+def build_serializer(depth, width, codegen=False):
+    """
+    Serializer of objects with `width` fields, one of them being a nested
+    object down to `depth` levels.
+    """
+    attributes = {"codegen": codegen}
+    for index in range(width - 1 if depth > 1 else width):
+        field = (input_serializer.StringSerializer, input_serializer.IntegerSerializer)[
+            index % 2
+        ]
+        attributes[f"field_{index}"] = field()
+    if depth > 1:
+        attributes["child"] = build_serializer(depth - 1, width, codegen)()
+    return type(f"Level{depth}Serializer", (input_serializer.Serializer,), attributes)
+
+
+def build_payload(depth, width):
+    payload = {
+        f"field_{index}": ("value", index)[index % 2]
+        for index in range(width - 1 if depth > 1 else width)
+    }
+    if depth > 1:
+        payload["child"] = build_payload(depth - 1, width)
+    return payload
+
+
+def get_benchmarks():
+    """
+    Benchmarked functions by name.
+    """
+    for index in range(100):
+        Book(f"Book {index}", 100 + index, uid=f"book-{index}").save()
+
+    book_event = create_api_gateway_event(path_parameters={"id": "book-1"})
+    benchmarks = {
+        "handler.create": (
+            CreateBook.as_handler(),
+            create_api_gateway_event(body={"title": "New", "pages": 10}),
+        ),
+        "handler.retrieve": (RetrieveBook.as_handler(), book_event),
+        "handler.list": (
+            ListBooks.as_handler(),
+            create_api_gateway_event(query_string={"limit": "20"}),
+        ),
+        "handler.update": (
+            UpdateBook.as_handler(),
+            create_api_gateway_event(path_parameters={"id": "book-1"}, body={"pages": 5}),
+        ),
+        "handler.delete": (DeleteBook.as_handler(), book_event),
+        "handler.api_gateway_standalone": (
+            Hello.as_handler(logger_level="WARNING"),
+            create_api_gateway_event(method="GET", path="/hello"),
+        ),
+    }
+    benchmarks = {
+        name: (lambda handler=handler, event=event: handler(event, CONTEXT))
+        for name, (handler, event) in benchmarks.items()
+    }
+
+    for depth, width in ((1, 5), (1, 50), (3, 5), (5, 10)):
+        payload = build_payload(depth, width)
+        for codegen in (False, True):
+            serializer = build_serializer(depth, width, codegen)()
+            name = f"input_serializer.depth{depth}_width{width}"
+            if codegen:
+                name += ".codegen"
+            benchmarks[name] = lambda serializer=serializer, payload=payload: (
+                serializer.serialize(payload)
+            )
+
+    book = Book.objects.get_or_none("book-1")
+    benchmarks["serializers.include"] = lambda: BookSerializer(instance=book).data
+
+    payload = {"uid": "e845205a36ed42efa0dcc5d35d343722", "email": "user@users.com"}
+    token = crypto.get_json_web_token(dict(payload))
+    hasher = crypto.PBKDF2PasswordHasher()
+    encoded_password = hasher.encode("benchmark-password")
+    benchmarks.update(
+        {
+            "crypto.get_json_web_token": lambda: crypto.get_json_web_token(dict(payload)),
+            "crypto.get_cached_json_web_token": lambda: crypto.get_cached_json_web_token(
+                payload
+            ),
+            "crypto.decode_json_web_token": lambda: crypto.decode_json_web_token(token),
+            "crypto.pbkdf2_verify": lambda: hasher.verify(
+                "benchmark-password", encoded_password
+            ),
+        }
+    )
+    return benchmarks
+
+
+# Slow benchmarks run fewer times
+NUMBER_DIVISORS = {"crypto.pbkdf2_verify": 100}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="calls per benchmark")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, function in get_benchmarks().items():
+        if args.filter not in name:
+            continue
+        number = max(args.number // NUMBER_DIVISORS.get(name, 1), 10)
+        result = results[name] = measure_latencies(function, number)
+        print(
+            f"{name:<48} {result['ops_per_sec']:>10.0f} ops/s"
+            f"  p50 {result['p50_us']:>9.1f} us  p99 {result['p99_us']:>9.1f} us"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                output,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
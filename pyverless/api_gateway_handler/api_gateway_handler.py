@@ -1,18 +1,43 @@
+from __future__ import annotations
+
 import json
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Dict, Type
-
-from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEvent
-from aws_lambda_powertools.utilities.data_classes.api_gateway_proxy_event import (
-    APIGatewayEventRequestContext,
-)
+from typing import List, Dict, Type, TYPE_CHECKING
 
 from pyverless.events_handler.events_handler import EventsHandler
+from pyverless.utils.imports import LazyImport, import_string
+from pyverless.utils.logging import get_enabled_logging_functions
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEvent
 
 logger = logging.getLogger("pyverless")
 
+# aws_lambda_powertools is imported on first use of these names, or when an
+# event is parsed, instead of on import
+POWERTOOLS_IMPORTS = {
+    "APIGatewayProxyEvent": (
+        "aws_lambda_powertools.utilities.data_classes.APIGatewayProxyEvent"
+    ),
+    "APIGatewayEventRequestContext": (
+        "aws_lambda_powertools.utilities.data_classes.api_gateway_proxy_event."
+        "APIGatewayEventRequestContext"
+    ),
+}
+
+
+def __getattr__(name):
+    if name == "APIGatewayWebsocketEvent":
+        value = create_websocket_event_class()
+    elif name in POWERTOOLS_IMPORTS:
+        value = import_string(POWERTOOLS_IMPORTS[name])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 
 @dataclass
 class ApiGatewayResponse:
@@ -42,27 +67,29 @@ class ErrorHandler:
 class ApiGatewayHandler(EventsHandler, ABC):
     success_code = 200
 
-    event_parsed: APIGatewayProxyEvent = None
-    event_parser = APIGatewayProxyEvent
+    event_parsed: APIGatewayProxyEvent
+    event_parser = LazyImport(POWERTOOLS_IMPORTS["APIGatewayProxyEvent"])
 
     logging_functions = [logger.info]
     error_handlers: List[ErrorHandler] = []
 
     def execute_lambda_code(self):
         request_id = self.context.aws_request_id
-        for function in self.logging_functions:
-            function(
-                {
-                    "type": "REQUEST_STARTED",
-                    "request_id": request_id,
-                    "path": self.event_parsed.path if self.event_parsed else None,
-                    "headers": self.event_parsed.headers if self.event_parsed else None,
-                    "method": self.event_parsed.http_method
-                    if self.event_parsed
-                    else None,
-                    "message": "request started",
-                }
-            )
+        # The log records, and the parsed event, are only built to be logged
+        logging_functions = get_enabled_logging_functions(self.logging_functions)
+        if logging_functions:
+            record = {
+                "type": "REQUEST_STARTED",
+                "request_id": request_id,
+                "path": self.event_parsed.path if self.event_parsed else None,
+                "headers": self.event_parsed.headers if self.event_parsed else None,
+                "method": self.event_parsed.http_method
+                if self.event_parsed
+                else None,
+                "message": "request started",
+            }
+            for function in logging_functions:
+                function(record)
 
         try:
             self.preprocess_function()
@@ -76,15 +103,15 @@ class ApiGatewayHandler(EventsHandler, ABC):
         except Exception as ex:
             response = self.process_error(exception=ex)
 
-        for function in self.logging_functions:
-            function(
-                {
-                    "type": "REQUEST_FINISHED",
-                    "request_id": request_id,
-                    "message": "request finished",
-                    "status_code": response.status_code,
-                }
-            )
+        if logging_functions:
+            record = {
+                "type": "REQUEST_FINISHED",
+                "request_id": request_id,
+                "message": "request finished",
+                "status_code": response.status_code,
+            }
+            for function in logging_functions:
+                function(record)
 
         return response
 
@@ -122,40 +149,51 @@ class ApiGatewayHandler(EventsHandler, ABC):
         raise NotImplementedError()
 
 
-class APIGatewayWebsocketEvent(APIGatewayEventRequestContext):
-    @property
-    def body(self):
-        return json.loads(self["body"])
+def create_websocket_event_class():
+    APIGatewayEventRequestContext = import_string(
+        POWERTOOLS_IMPORTS["APIGatewayEventRequestContext"]
+    )
+
+    class APIGatewayWebsocketEvent(APIGatewayEventRequestContext):
+        @property
+        def body(self):
+            return json.loads(self["body"])
+
+    APIGatewayWebsocketEvent.__module__ = __name__
+    APIGatewayWebsocketEvent.__qualname__ = "APIGatewayWebsocketEvent"
+    return APIGatewayWebsocketEvent
 
 
 class ApiGatewayWSHandler(EventsHandler, ABC):
     success_code = 200
 
-    event_parsed: APIGatewayWebsocketEvent = None
-    event_parser = APIGatewayWebsocketEvent
+    event_parsed: APIGatewayWebsocketEvent
+    event_parser = LazyImport(f"{__name__}.APIGatewayWebsocketEvent")
 
     logging_functions = [logger.info]
     error_handlers: List[ErrorHandler] = []
 
     def execute_lambda_code(self):
         request_id = self.context.aws_request_id
-        for function in self.logging_functions:
-            function(
-                {
-                    "type": "REQUEST_STARTED",
-                    "request_id": request_id,
-                    "route_key": self.event_parsed.route_key
-                    if self.event_parsed
-                    else None,
-                    "event_type": self.event_parsed.event_type
-                    if self.event_parsed
-                    else None,
-                    "connection_id": self.event_parsed.connection_id
-                    if self.event_parsed
-                    else None,
-                    "message": "request started",
-                }
-            )
+        # The log records, and the parsed event, are only built to be logged
+        logging_functions = get_enabled_logging_functions(self.logging_functions)
+        if logging_functions:
+            record = {
+                "type": "REQUEST_STARTED",
+                "request_id": request_id,
+                "route_key": self.event_parsed.route_key
+                if self.event_parsed
+                else None,
+                "event_type": self.event_parsed.event_type
+                if self.event_parsed
+                else None,
+                "connection_id": self.event_parsed.connection_id
+                if self.event_parsed
+                else None,
+                "message": "request started",
+            }
+            for function in logging_functions:
+                function(record)
 
         try:
             self.preprocess_function()
@@ -169,15 +207,15 @@ class ApiGatewayWSHandler(EventsHandler, ABC):
         except Exception as ex:
             response = self.process_error(exception=ex)
 
-        for function in self.logging_functions:
-            function(
-                {
-                    "type": "REQUEST_FINISHED",
-                    "request_id": request_id,
-                    "message": "request finished",
-                    "status_code": response.status_code,
-                }
-            )
+        if logging_functions:
+            record = {
+                "type": "REQUEST_FINISHED",
+                "request_id": request_id,
+                "message": "request finished",
+                "status_code": response.status_code,
+            }
+            for function in logging_functions:
+                function(record)
 
         return response
 
@@ -1,21 +1,44 @@
-from pyverless.crypto import PBKDF2PasswordHasher
+import asyncio
+
+from pyverless.crypto import check_password, get_password_executor, hash_password
 from pyverless.models import get_user_by_email
 
 
 def authenticate(email, password):
     """
     Returns the user_id in case the user exists, None otherwise
-    """
-    hasher = PBKDF2PasswordHasher()
 
+    When the password is valid but was hashed with an outdated algorithm or
+    cost, it is hashed again with the preferred hasher and the user saved.
+    """
     # Get user by email
     user = get_user_by_email(email=email)
 
     if user and user.password:
+
+        def rehash(password):
+            user.password = hash_password(password)
+            user.save()
+
         # Verify the password. Return User if it's valid
-        valid_password = hasher.verify(password, user.password)
+        valid_password = check_password(password, user.password, setter=rehash)
 
         if valid_password:
             return user
 
     return None
+
+
+def authenticate_async(email, password):
+    """
+    authenticate on the password hashing thread pool, returns a
+    concurrent.futures.Future.
+    """
+    return get_password_executor().submit(authenticate, email, password)
+
+
+async def aauthenticate(email, password):
+    """
+    authenticate awaitable from asyncio code.
+    """
+    return await asyncio.wrap_future(authenticate_async(email, password))
@@ -4,36 +4,80 @@ pyverless.config
 """
 import importlib
 import os
-from yaml import load, FullLoader
+from collections import namedtuple
 
 ENVIRONMENT_VARIABLE = "PYVERLESS_SETTINGS"
 BASE_SETTINGS_MODULE = 'pyverless.config.base_settings'
 
+TRUE_VALUES = {'true', '1', 'yes', 'on'}
+FALSE_VALUES = {'false', '0', 'no', 'off', ''}
+
+
+def to_bool(value):
+    if value.strip().lower() in TRUE_VALUES:
+        return True
+    if value.strip().lower() in FALSE_VALUES:
+        return False
+    raise ValueError('Invalid boolean %r' % value)
+
+
+def to_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# Functions converting environment variables to the type of a setting
+COERCIONS = {
+    bool: to_bool,
+    int: int,
+    float: float,
+    list: to_list,
+    str: str,
+}
+
+
+def coerce(setting, value, schema):
+    """
+    Convert the string value of a setting to the type declared in schema.
+    """
+    coercion = COERCIONS.get(schema.get(setting))
+    if coercion is None or not isinstance(value, str):
+        return value
+    try:
+        return coercion(value)
+    except ValueError:
+        raise ValueError('Invalid value %r for setting %s' % (value, setting))
+
 
 class Settings:
     """
     Settings
     """
 
-    def __init__(self, source=None):
+    def __init__(self, source=None, use_snapshot=True):
         """
         Load the settings source pointed to by the environment variable.
         The source may be one of the following:
         - A Python module
         - A YAML file (.yml/.yaml)
+
+        A fresh snapshot of the source (see pyverless.config.snapshot) is
+        loaded instead when there is one, unless use_snapshot is False.
         """
 
+        # load user settings from module or yaml file. The source can be passed
+        # on istantiation of Settings or through ENVIRONMENT_VARIABLE
+        if not source:
+            source = os.environ.get(ENVIRONMENT_VARIABLE)
+
+        if source and use_snapshot and self.load_from_snapshot(source):
+            return
+
         # load base settings from base settings module
         self.load_from_module(BASE_SETTINGS_MODULE)
 
-        # load user settings from module or yaml file. The source can be passed
-        # on istantiation of Settings or through ENVIRONMENT_VARIABLE
         if not source:
-            try:
-                source = os.environ[ENVIRONMENT_VARIABLE]
-            except KeyError:
-                self.load_from_environ()
-                return
+            self.load_from_environ()
+            return
 
         # Obtain extension
         _, filext = source.rsplit('.', 1)
@@ -45,12 +89,33 @@ class Settings:
         else:
             self.load_from_module(source)
 
+    def load_from_snapshot(self, source):
+        """
+        load_from_snapshot, returns whether a fresh snapshot was found
+        """
+        from pyverless.config.snapshot import load_snapshot
+
+        settings = load_snapshot(source)
+        if settings is None:
+            return False
+
+        for setting, value in settings.items():
+            setattr(self, setting, value)
+        return True
+
     def load_from_yaml_file(self, file):
         """
         load_from_yaml_file
         """
+        # Only imported by YAML settings sources
+        from yaml import load
+        try:
+            from yaml import CSafeLoader as Loader
+        except ImportError:
+            from yaml import SafeLoader as Loader
+
         with open(file, mode='rb') as yaml_file:
-            settings = load(yaml_file, Loader=FullLoader)
+            settings = load(yaml_file, Loader=Loader)
 
         if settings:  # setting file might be empty
             for setting, value in settings.items():
@@ -68,8 +133,47 @@ class Settings:
                 setattr(self, setting, getattr(settings_module, setting))
 
     def load_from_environ(self):
-        for setting, value in os.environ.items():
-            setattr(self, setting, value)
+        """
+        Settings are read from environment variables when first accessed,
+        coerced to the type of the setting in the schema and cached. Settings
+        without an environment variable take their base settings value.
+        """
+        base_settings = importlib.import_module(BASE_SETTINGS_MODULE)
+        self._schema = dict(getattr(base_settings, '__annotations__', {}))
+        self._defaults = {}
+        for setting in list(vars(self)):
+            if setting.isupper():
+                self._defaults[setting] = self.__dict__.pop(setting)
+
+    def __getattr__(self, setting):
+        # Only called for settings not resolved yet, in environ mode
+        defaults = self.__dict__.get('_defaults')
+        if defaults is None or not setting.isupper():
+            raise AttributeError(setting)
+
+        if setting in os.environ:
+            value = coerce(setting, os.environ[setting], self._schema)
+        elif setting in defaults:
+            value = defaults[setting]
+        else:
+            raise AttributeError(setting)
+
+        setattr(self, setting, value)
+        return value
+
+    def freeze(self):
+        """
+        Returns a read-only view (a namedtuple) of the current values of the
+        settings: those of the schema, plus the user settings of module and
+        YAML sources, or already read environment variables.
+        """
+        names = set(vars(self)) | set(self.__dict__.get('_defaults', ()))
+        names = sorted(
+            name for name in names if name.isupper() and name.isidentifier()
+        )
+        return namedtuple('FrozenSettings', names)(
+            *(getattr(self, name) for name in names)
+        )
 
 
 settings = Settings()
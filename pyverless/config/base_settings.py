@@ -1,16 +1,38 @@
-USER_MODEL = None
-MODEL_MANAGER = 'objects'
-SECRET_KEY = None
+# Settings are annotated with their type, used to coerce the values of settings
+# read from environment variables
+USER_MODEL: str = None
+MODEL_MANAGER: str = 'objects'
+USER_CACHE_SIZE: int = 0
+USER_CACHE_TTL: float = 60
+USER_CACHE_NEGATIVE_TTL: float = 5
+SECRET_KEY: str = None
+PASSWORD_HASHERS: list = [
+    'pyverless.crypto.PBKDF2PasswordHasher',
+    'pyverless.crypto.PBKDF2SHA1PasswordHasher',
+    'pyverless.crypto.ScryptPasswordHasher',
+]
 
-CORS_ORIGIN = "*"
-CORS_HEADERS = "*"
+CORS_ORIGIN: str = "*"
+CORS_HEADERS: str = "*"
 
-JWT_EXPIRY = 300
-JWT_LEEWAY = 60
-JWT_ALGORITHM = 'HS256'
+JWT_EXPIRY: int = 300
+JWT_LEEWAY: int = 60
+JWT_ALGORITHM: str = 'HS256'
+JWT_DECODE_CACHE_SIZE: int = 0
+JWT_MINT_CACHE_SIZE: int = 128
+JWT_MINT_REFRESH_AHEAD: int = 30
+JWT_KID: str = None
+JWT_PRIVATE_KEY: str = None
+JWT_PUBLIC_KEY: str = None
+JWT_JWKS_FILE: str = None
 
-WARMUP_LOG = True
-DEBUG = False
+WARMUP_LOG: bool = True
+DEBUG: bool = False
 
-USE_SENTRY = False
-SENTRY_DNS = ""
+USE_SENTRY: bool = False
+SENTRY_DNS: str = ""
+SENTRY_QUEUE_SIZE: int = 100
+SENTRY_RATE_LIMIT: int = 10
+SENTRY_RATE_WINDOW: float = 60
+SENTRY_SAMPLE_RATE: float = 1.0
+SENTRY_FLUSH_TIMEOUT: float = 2
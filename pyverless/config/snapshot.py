@@ -0,0 +1,203 @@
+"""
+Settings snapshots.
+
+A snapshot is a pickle of the settings loaded from a module or YAML source
+(base settings included), built at deploy time so cold starts unpickle a dict
+instead of parsing YAML or executing the settings modules. Settings use the
+snapshot of their source when it is present and fresh, that is, built from the
+current contents of the source and base settings files, and of the modules the
+source imports (followed statically, e.g. a chain of `from .base import *`,
+leaving out the standard library and installed packages). A snapshot that can
+not be read is ignored.
+
+The snapshot is found next to the source file (e.g. settings.yml.snapshot) or
+at the path in the PYVERLESS_SETTINGS_SNAPSHOT environment variable. Build it
+with:
+
+    python -m pyverless.config.snapshot [source] [--output path]
+
+Values computed by settings modules when they run (e.g. read from the
+environment) are frozen in the snapshot.
+"""
+import hashlib
+import importlib.util
+import logging
+import os
+import pickle
+
+logger = logging.getLogger("pyverless")
+
+SNAPSHOT_ENVIRONMENT_VARIABLE = "PYVERLESS_SETTINGS_SNAPSHOT"
+SNAPSHOT_VERSION = 2
+# Supported by every python version pyverless supports
+PICKLE_PROTOCOL = 4
+
+
+def get_source_file(source):
+    """
+    Path of the file of a settings source, a YAML file or a module.
+    """
+    if source.rsplit(".", 1)[-1] in ["yml", "yaml"]:
+        return source
+    return importlib.util.find_spec(source).origin
+
+
+def get_snapshot_path(source):
+    return os.environ.get(SNAPSHOT_ENVIRONMENT_VARIABLE) or (
+        get_source_file(source) + ".snapshot"
+    )
+
+
+def get_dependencies(source):
+    """
+    Paths of the files the settings of source are loaded from: the base
+    settings, the source and the modules it imports, recursively.
+    """
+    from pyverless.config import BASE_SETTINGS_MODULE
+
+    paths = [get_source_file(BASE_SETTINGS_MODULE), get_source_file(source)]
+    if paths[1] != source:
+        paths.extend(get_imported_files(source, excluded=set(paths)))
+    return paths
+
+
+def get_imported_files(module, excluded):
+    """
+    Source files of the modules imported by module, recursively, found by
+    parsing the import statements. Modules of the standard library and of
+    installed packages are left out.
+    """
+    import ast
+    import sysconfig
+
+    installed = tuple(
+        os.path.join(sysconfig.get_paths()[name], "")
+        for name in ["stdlib", "platstdlib", "purelib", "platlib"]
+    )
+
+    files = []
+    pending = [module]
+    seen = {module}
+    while pending:
+        name = pending.pop()
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            continue
+        origin = spec and spec.origin
+        if not origin or not origin.endswith(".py") or origin.startswith(installed):
+            continue
+        if origin not in excluded:
+            excluded.add(origin)
+            files.append(origin)
+
+        with open(origin, "rb") as module_file:
+            tree = ast.parse(module_file.read(), origin)
+        package = name if spec.submodule_search_locations else name.rpartition(".")[0]
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                try:
+                    base = importlib.util.resolve_name(
+                        "." * node.level + (node.module or ""), package
+                    )
+                except ImportError:
+                    continue
+                # Imported names may be submodules
+                names = [base] + [f"{base}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for imported in names:
+                if imported not in seen:
+                    seen.add(imported)
+                    pending.append(imported)
+    return files
+
+
+def get_fingerprint(paths):
+    """
+    Digest of the settings files, identifying the settings a snapshot was
+    built from.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as source_file:
+            digest.update(hashlib.sha256(source_file.read()).digest())
+    return digest.hexdigest()
+
+
+def build_snapshot(source, path=None):
+    """
+    Load the settings of source and write their snapshot. Returns its path.
+    """
+    from pyverless.config import Settings
+
+    settings = Settings(source, use_snapshot=False)
+    paths = get_dependencies(source)
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "source": source,
+        "paths": paths,
+        "fingerprint": get_fingerprint(paths),
+        "settings": vars(settings),
+    }
+
+    path = path or get_snapshot_path(source)
+    with open(path, "wb") as snapshot_file:
+        pickle.dump(snapshot, snapshot_file, protocol=PICKLE_PROTOCOL)
+    return path
+
+
+def load_snapshot(source, path=None):
+    """
+    Returns the settings of the snapshot of source, None when there is no
+    snapshot, it is stale or it can not be read (truncated, corrupt,
+    unreadable...), so the settings are loaded from the source instead.
+    """
+    try:
+        path = path or get_snapshot_path(source)
+        with open(path, "rb") as snapshot_file:
+            snapshot = pickle.load(snapshot_file)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning("Ignoring unreadable settings snapshot", exc_info=True)
+        return None
+
+    try:
+        if (
+            snapshot["version"] != SNAPSHOT_VERSION
+            or snapshot["source"] != source
+            or snapshot["fingerprint"] != get_fingerprint(snapshot["paths"])
+        ):
+            return None
+        return snapshot["settings"]
+    except Exception:
+        # e.g. a settings file removed since the snapshot was built
+        logger.warning("Ignoring invalid settings snapshot", exc_info=True)
+        return None
+
+
+def main(argv=None):
+    import argparse
+
+    from pyverless.config import ENVIRONMENT_VARIABLE
+
+    parser = argparse.ArgumentParser(description="Build a settings snapshot.")
+    parser.add_argument(
+        "source",
+        nargs="?",
+        default=os.environ.get(ENVIRONMENT_VARIABLE),
+        help=f"settings module or YAML file, defaults to ${ENVIRONMENT_VARIABLE}",
+    )
+    parser.add_argument("--output", help="snapshot path")
+    args = parser.parse_args(argv)
+    if not args.source:
+        parser.error("no settings source")
+
+    print(build_snapshot(args.source, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,35 @@
+import asyncio
 import base64
 from calendar import timegm
 import hashlib
 import hmac
-import jwt
-import random
+import importlib
+import json
+import logging
+import os
+import secrets
+import threading
 import time
 from datetime import datetime
+from functools import lru_cache
 
 from pyverless.exceptions import Unauthorized
 from pyverless.config import settings
+from pyverless.keys import get_key_manager
+from pyverless.utils.cache import MISSING, TTLCache
+from pyverless.utils.concurrency import get_executor
+
+logger = logging.getLogger("pyverless")
+
+# Claims of verified tokens, kept until the tokens expire. Disabled unless
+# JWT_DECODE_CACHE_SIZE is set, hits and misses are available through
+# decoded_tokens_cache.stats()
+decoded_tokens_cache = TTLCache(max_size=int(settings.JWT_DECODE_CACHE_SIZE))
+
+# Tokens minted by get_cached_json_web_token, by payload
+minted_tokens_cache = TTLCache(max_size=int(settings.JWT_MINT_CACHE_SIZE))
+_refreshing_tokens = set()
+_refreshing_tokens_lock = threading.Lock()
 
 
 def get_json_web_token(payload, expires=True, expiry=settings.JWT_EXPIRY):
@@ -21,23 +42,120 @@ def get_json_web_token(payload, expires=True, expiry=settings.JWT_EXPIRY):
         now = timegm(datetime.utcnow().utctimetuple())
         payload['exp'] = now + int(expiry)
 
-    return jwt.encode(payload, settings.SECRET_KEY, settings.JWT_ALGORITHM).decode('utf-8')
+    return get_key_manager().encode(payload)
+
+
+def get_cached_json_web_token(payload, expiry=settings.JWT_EXPIRY,
+                              refresh_ahead=settings.JWT_MINT_REFRESH_AHEAD):
+    """
+    Returns a JWT given a payload, reusing the token minted for an equal payload
+    while it is valid. The payload is not modified.
+
+    Tokens are minted again in the background once they are within
+    refresh_ahead seconds of expiring (or past half their lifetime for short
+    expiries), and synchronously when they expired.
+    """
+    expiry = int(expiry)
+    key_manager = get_key_manager()
+    cache_key = (
+        key_manager.uid,
+        key_manager.generation,
+        expiry,
+        json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str),
+    )
+
+    entry = minted_tokens_cache.get(cache_key)
+    if entry is not MISSING:
+        token, refresh_at = entry
+        if timegm(datetime.utcnow().utctimetuple()) >= refresh_at:
+            refresh_token(cache_key, dict(payload), expiry, int(refresh_ahead))
+        return token
+
+    return mint_token(cache_key, payload, expiry, int(refresh_ahead))
+
+
+def mint_token(cache_key, payload, expiry, refresh_ahead):
+    """
+    Mint a token for a copy of payload and store it in the minted tokens cache.
+    """
+    payload = dict(payload)
+    token = get_json_web_token(payload, expiry=expiry)
+    refresh_at = payload['exp'] - min(refresh_ahead, expiry // 2)
+    minted_tokens_cache.set(cache_key, (token, refresh_at), ttl=payload['exp'] - time.time())
+    return token
+
+
+def refresh_token(cache_key, payload, expiry, refresh_ahead):
+    """
+    Mint the token of cache_key on the jwt thread pool, unless it is already
+    being refreshed.
+    """
+    with _refreshing_tokens_lock:
+        if cache_key in _refreshing_tokens:
+            return
+        _refreshing_tokens.add(cache_key)
+
+    def refresh():
+        try:
+            mint_token(cache_key, payload, expiry, refresh_ahead)
+        except Exception:
+            logger.exception("Error refreshing a json web token")
+        finally:
+            with _refreshing_tokens_lock:
+                _refreshing_tokens.discard(cache_key)
+
+    get_executor("jwt").submit(refresh)
 
 
 def decode_json_web_token(token, leeway=settings.JWT_LEEWAY):
     """
-    Decode a JWT. Leeway time may be provided.
+    Decode a JWT. Leeway time may be provided. The verification key is chosen
+    by the key manager, after the 'kid' header of the token.
+
+    When the decoded tokens cache is enabled, the claims of verified tokens are
+    returned from it until the tokens expire (taking leeway into account).
     """
+    import jwt
+
+    key_manager = get_key_manager()
+    use_cache = decoded_tokens_cache.max_size > 0
+    if use_cache:
+        # Fetch the JWKS document if it expired, changing the generation of the
+        # key manager so claims verified with removed keys are not returned
+        key_manager.refresh_jwks()
+        now = timegm(datetime.utcnow().utctimetuple())
+        cache_key = get_token_cache_key(token, key_manager)
+        decoded = decoded_tokens_cache.get(cache_key)
+        if decoded is not MISSING:
+            if 'exp' not in decoded or decoded['exp'] >= now - leeway:
+                return dict(decoded)
+
     try:
-        decoded = jwt.decode(token, settings.SECRET_KEY, leeway=leeway, algorithms=[settings.JWT_ALGORITHM])
-    except jwt.exceptions.DecodeError:
-        raise Unauthorized()
-    except jwt.exceptions.ExpiredSignatureError:
+        decoded = key_manager.decode(token, leeway=leeway)
+    except jwt.exceptions.InvalidTokenError:
+        # Base class of DecodeError, ExpiredSignatureError and the errors of
+        # malformed headers, e.g. a kid not being a string
         raise Unauthorized()
 
+    if use_cache:
+        # Same expiry check as PyJwt: exp < now - leeway
+        ttl = decoded['exp'] + leeway - now + 1 if 'exp' in decoded else None
+        decoded_tokens_cache.set(cache_key, dict(decoded), ttl=ttl)
+
     return decoded
 
 
+def get_token_cache_key(token, key_manager):
+    """
+    Key of a token in the decoded tokens cache. It depends on the key manager
+    and its keys, so replacing or rotating them invalidates the cached claims.
+    """
+    if isinstance(token, str):
+        token = token.encode('utf-8')
+    key = ('%s$%s$' % (key_manager.uid, key_manager.generation)).encode('utf-8')
+    return hashlib.sha256(key + token).digest()
+
+
 def is_expired(expiry):
     """
     Check if the expiry seconds provided is before or after now. This code is
@@ -52,20 +170,68 @@ def is_expired(expiry):
 # and it can be found here:
 # https://github.com/django/django/blob/master/django/contrib/auth/hashers.py
 # https://github.com/django/django/blob/master/django/utils/crypto.py
-def get_random_string(length=12,
-                      allowed_chars='abcdefghijklmnopqrstuvwxyz'
-                                    'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'):
+RANDOM_STRING_CHARS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+
+def get_random_string(length=12, allowed_chars=RANDOM_STRING_CHARS):
     """
     Return a securely generated random string.
     The default length of 12 with the a-z, A-Z, 0-9 character set returns
     a 71-bit value. log_2((26+26+10)^12) =~ 71 bits
     """
-    random.seed(
-        hashlib.sha256(
-            ('%s%s%s' % (random.getstate(), time.time(), settings.SECRET_KEY)).encode()
-        ).digest()
-    )
-    return ''.join(random.choice(allowed_chars) for i in range(length))
+    return get_random_chars(length, allowed_chars)
+
+
+def get_random_strings(count, length=12, allowed_chars=RANDOM_STRING_CHARS):
+    """
+    Return a list of count securely generated random strings, drawing the
+    random bytes of all of them at once.
+    """
+    chars = get_random_chars(count * length, allowed_chars)
+    return [chars[i:i + length] for i in range(0, count * length, length)]
+
+
+def get_random_chars(length, allowed_chars):
+    """
+    Return length characters of allowed_chars drawn from os.urandom.
+
+    Random bytes are mapped to ASCII alphabets with bytes.translate, deleting
+    the bytes above the largest multiple of the alphabet size (rejection
+    sampling) so every character is equally likely. Other alphabets, and
+    sequences other than strings (e.g. lists), go through secrets.choice.
+    """
+    alphabet_table = None
+    if isinstance(allowed_chars, str):
+        alphabet_table = get_alphabet_table(allowed_chars)
+    if alphabet_table is None:
+        return ''.join(secrets.choice(allowed_chars) for i in range(length))
+
+    table, delete, accepted = alphabet_table
+    chars = b''
+    while len(chars) < length:
+        missing = length - len(chars)
+        # Draw enough bytes to get the missing characters most of the time
+        chars += os.urandom(missing * 256 // accepted + 16).translate(table, delete)
+    return chars[:length].decode('ascii')
+
+
+@lru_cache(maxsize=32)
+def get_alphabet_table(allowed_chars):
+    """
+    Returns the bytes.translate table and deleted bytes mapping random bytes to
+    allowed_chars, and the number of accepted bytes. None if allowed_chars is
+    not made of up to 256 ASCII characters.
+    """
+    try:
+        chars = allowed_chars.encode('ascii')
+    except UnicodeEncodeError:
+        return None
+    if not 0 < len(chars) <= 256:
+        return None
+
+    accepted = 256 - 256 % len(chars)
+    table = bytes(chars[byte % len(chars)] for byte in range(256))
+    return table, bytes(range(accepted, 256)), accepted
 
 
 def constant_time_compare(val1, val2):
@@ -113,3 +279,178 @@ class PBKDF2PasswordHasher():
         assert algorithm == self.algorithm
         encoded_2 = self.encode(password, salt, int(iterations))
         return constant_time_compare(encoded, encoded_2)
+
+    def decode(self, encoded):
+        algorithm, iterations, salt, hash = encoded.split('$', 3)
+        assert algorithm == self.algorithm
+        return {
+            'algorithm': algorithm,
+            'iterations': int(iterations),
+            'salt': salt,
+            'hash': hash,
+        }
+
+    def must_update(self, encoded):
+        """
+        Whether encoded uses fewer iterations than the hasher.
+        """
+        return self.decode(encoded)['iterations'] < self.iterations
+
+
+class PBKDF2SHA1PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 + HMAC + SHA1, to verify passwords hashed by systems using it.
+    """
+    algorithm = "pbkdf2_sha1"
+    digest = hashlib.sha1
+
+
+class ScryptPasswordHasher():
+    """
+    Secure password hashing using the scrypt algorithm. The cost parameters
+    (work factor, block size and parallelism) are stored in the encoded
+    password, so passwords hashed with different costs can be verified.
+    """
+    algorithm = "scrypt"
+    work_factor = 2 ** 14
+    block_size = 8
+    parallelism = 1
+    dklen = 64
+
+    def encode(self, password, salt=None, n=None, r=None, p=None):
+        assert password is not None
+        if not salt:
+            salt = get_random_string()
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+
+        hash = hashlib.scrypt(
+            password.encode('utf-8', 'strict'),
+            salt=salt.encode('utf-8', 'strict'),
+            n=n,
+            r=r,
+            p=p,
+            # scrypt needs 128 * n * r * p bytes, plus some margin
+            maxmem=256 * n * r * p,
+            dklen=self.dklen,
+        )
+        hash = base64.b64encode(hash).decode('ascii').strip()
+        return "%s$%d$%s$%d$%d$%s" % (self.algorithm, n, salt, r, p, hash)
+
+    def decode(self, encoded):
+        algorithm, work_factor, salt, block_size, parallelism, hash = encoded.split('$', 5)
+        assert algorithm == self.algorithm
+        return {
+            'algorithm': algorithm,
+            'work_factor': int(work_factor),
+            'salt': salt,
+            'block_size': int(block_size),
+            'parallelism': int(parallelism),
+            'hash': hash,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(
+            password, decoded['salt'], decoded['work_factor'], decoded['block_size'], decoded['parallelism']
+        )
+        return constant_time_compare(encoded, encoded_2)
+
+    def must_update(self, encoded):
+        """
+        Whether encoded uses a lower cost than the hasher.
+        """
+        decoded = self.decode(encoded)
+        return (
+            decoded['work_factor'] < self.work_factor
+            or decoded['block_size'] != self.block_size
+            or decoded['parallelism'] != self.parallelism
+        )
+
+
+# Hasher instances by PASSWORD_HASHERS
+_hashers = {}
+
+
+def get_hashers():
+    """
+    Returns instances of the PASSWORD_HASHERS. The first one encodes new
+    passwords, the others are only used to verify existing ones.
+    """
+    paths = settings.PASSWORD_HASHERS
+    if isinstance(paths, str):
+        paths = paths.split(',')
+    paths = tuple(paths)
+
+    hashers = _hashers.get(paths)
+    if hashers is None:
+        hashers = []
+        for path in paths:
+            module, name = path.strip().rsplit('.', 1)
+            hashers.append(getattr(importlib.import_module(module), name)())
+        _hashers[paths] = hashers
+    return hashers
+
+
+def identify_hasher(encoded):
+    """
+    Returns the hasher of an encoded password, after its algorithm prefix.
+    """
+    algorithm = encoded.split('$', 1)[0]
+    for hasher in get_hashers():
+        if hasher.algorithm == algorithm:
+            return hasher
+    raise ValueError('Unknown password hashing algorithm %s' % algorithm)
+
+
+def check_password(password, encoded, setter=None):
+    """
+    Returns whether password matches the encoded password. When it does but
+    encoded was produced by another algorithm or with a lower cost than the
+    preferred hasher, setter is called with the password so it can be hashed
+    again (see hash_password).
+    """
+    if not encoded:
+        return False
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+
+    valid = hasher.verify(password, encoded)
+    if valid and setter is not None:
+        preferred = get_hashers()[0]
+        if hasher.algorithm != preferred.algorithm or preferred.must_update(encoded):
+            setter(password)
+    return valid
+
+
+def hash_password(password):
+    """
+    Returns password encoded by the preferred hasher.
+    """
+    return get_hashers()[0].encode(password)
+
+
+def get_password_executor():
+    """
+    Thread pool hashing passwords. hashlib releases the GIL while hashing, so
+    other threads keep running.
+    """
+    return get_executor("password", max_workers=os.cpu_count() or 1)
+
+
+def check_password_async(password, encoded, setter=None):
+    """
+    check_password on the password hashing thread pool, returns a
+    concurrent.futures.Future.
+    """
+    return get_password_executor().submit(check_password, password, encoded, setter)
+
+
+async def acheck_password(password, encoded, setter=None):
+    """
+    check_password awaitable from asyncio code.
+    """
+    return await asyncio.wrap_future(check_password_async(password, encoded, setter))
@@ -1,20 +1,25 @@
 import logging
 from abc import abstractmethod, ABC
+from logging import INFO
 
 from pyverless.decorators import warmup
-from pyverless.utils.logging import initialize_logger
+from pyverless.utils.logging import configure_logging, set_aws_request_id
 
 logger = logging.getLogger("pyverless")
 
+# Value of _event_parsed until the event is parsed
+NOT_PARSED = object()
+
 
 class EventsHandler(ABC):
 
     event_parser = None
     event = None
     context = None
-    event_parsed = None
     response = None
 
+    _event_parsed = NOT_PARSED
+
     dependency_container = None
 
     def __init__(self, dependency_container=None):
@@ -24,12 +29,10 @@ class EventsHandler(ABC):
         try:
             self.event = event
             self.context = context
+            self._event_parsed = NOT_PARSED
 
-            logger.info({"event": self.event, "message": "lambda started"})
-
-            self.event_parsed = (
-                self.event_parser(self.event) if self.event_parser else None
-            )
+            if logger.isEnabledFor(INFO):
+                logger.info({"event": self.event, "message": "lambda started"})
 
             self.response = self.execute_lambda_code()
 
@@ -38,6 +41,22 @@ class EventsHandler(ABC):
 
         return self.render_response()
 
+    @property
+    def event_parsed(self):
+        """
+        The event parsed by event_parser (None without parser), built on first
+        access.
+        """
+        if self._event_parsed is NOT_PARSED:
+            self._event_parsed = (
+                self.event_parser(self.event) if self.event_parser else None
+            )
+        return self._event_parsed
+
+    @event_parsed.setter
+    def event_parsed(self, value):
+        self._event_parsed = value
+
     def execute_lambda_code(self):
         return self.perform_action()
 
@@ -65,13 +84,13 @@ class EventsHandler(ABC):
         """
         @warmup
         def handler(event, context):
-
-            initialize_logger(
+            # Only the first invocation of the container configures logging
+            configure_logging(
                 logger_level=logger_level,
                 sentry_dns=sentry_dns,
                 environment=environment,
-                aws_request_id=context.aws_request_id,
             )
+            set_aws_request_id(context.aws_request_id)
 
             self = cls(dependency_container=dependency_container)
             return self.lambda_handler(event, context)
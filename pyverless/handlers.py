@@ -1,16 +1,130 @@
 import json
 import logging
 import traceback
-from typing import Union, Any
+from abc import ABCMeta
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextvars import ContextVar, copy_context
+from operator import methodcaller
+from types import FunctionType
+from typing import Union, Any, Callable, NamedTuple, Optional, Tuple
 import base64
 
-import sentry_sdk
-from sentry_sdk import capture_exception, configure_scope
-
 from pyverless.config import settings
 from pyverless.decorators import warmup
-from pyverless.models import get_user_model
+from pyverless.models import get_model_manager, get_user_by_uid
 from pyverless.exceptions import BadRequest, Unauthorized, NotFound
+from pyverless.utils.concurrency import get_executor
+from pyverless.utils.sentry import get_flush_timeout, get_reporter
+
+
+# Attributes set on the handler, in order, by each invocation, and the methods
+# returning them. Steps whose method is not available on the handler are skipped.
+PIPELINE = (
+    ("body", "get_body"),
+    ("queryparams", "get_queryparams"),
+    ("user", "get_user"),
+    ("queryset", "get_queryset"),
+    ("object", "get_object"),
+    ("messages", "get_messages"),
+    ("file", "get_file"),
+    ("response_body", "perform_action"),
+)
+
+PIPELINE_METHODS = frozenset(method for _, method in PIPELINE)
+
+
+class PipelineStep(NamedTuple):
+    attr: str
+    method: str
+    # class of the handler MRO (usually a mixin) implementing the method
+    provider: type
+    # unbound function of the method, called with the handler
+    function: Callable
+
+
+def get_step_function(provider: type, method: str) -> Callable:
+    """
+    Returns the function of a pipeline method, resolved once. Methods that are
+    not plain functions (e.g. static methods) are looked up on each call.
+    """
+    function = provider.__dict__.get(method) if provider is not None else None
+    if isinstance(function, FunctionType):
+        return function
+    return methodcaller(method)
+
+
+class StepOutcome(NamedTuple):
+    """
+    Result of a pipeline step run concurrently, with the error it set on the
+    handler and the exception it raised, if any.
+    """
+
+    value: Any
+    error: Optional[tuple]
+    exception: Optional[Exception]
+
+
+class _StepState:
+    __slots__ = ("handler", "error")
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.error = None
+
+
+# State of the pipeline step running in the current context, see PipelineError
+_step_state: ContextVar = ContextVar("pipeline_step_state", default=None)
+
+
+class PipelineError:
+    """
+    Descriptor of BaseHandler.error. While pipeline steps run concurrently, each
+    step reads and sets its own error, so steps failing at the same time do not
+    overwrite each other's.
+    """
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        state = _step_state.get()
+        if state is not None and state.handler is instance:
+            return state.error
+        return instance.__dict__.get("error")
+
+    def __set__(self, instance, value):
+        state = _step_state.get()
+        if state is not None and state.handler is instance:
+            state.error = value
+        else:
+            instance.__dict__["error"] = value
+
+
+class HandlerMeta(ABCMeta):
+    """
+    Metaclass of handlers. Replacing a pipeline method on a handler class (e.g.
+    Handler.get_queryset = get_queryset) drops the pipelines cached by the
+    class and its subclasses, so they are computed again with the new function.
+    Based on ABCMeta so handlers can be mixed with abstract classes.
+    """
+
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        if name in PIPELINE_METHODS:
+            cls._clear_pipeline()
+
+    def __delattr__(cls, name):
+        super().__delattr__(name)
+        if name in PIPELINE_METHODS:
+            cls._clear_pipeline()
+
+    def _clear_pipeline(cls):
+        classes = [cls]
+        while classes:
+            klass = classes.pop()
+            for cached in ("_pipeline", "_pipeline_graph"):
+                if cached in klass.__dict__:
+                    type.__delattr__(klass, cached)
+            classes.extend(klass.__subclasses__())
 
 
 class RequestBodyMixin:
@@ -221,8 +335,7 @@ class AuthorizationMixin:
             self.error = ("Unauthorized", 403)
             raise Unauthorized()
 
-        UserModel = get_user_model()
-        user = getattr(UserModel, settings.MODEL_MANAGER).get_or_none(uid=user_id)
+        user = get_user_by_uid(user_id)
 
         if user:
             return user
@@ -269,7 +382,7 @@ class ObjectMixin:
         return obj
 
     def get_queryset(self):
-        return getattr(self.model, settings.MODEL_MANAGER)
+        return get_model_manager(self.model)
 
     def serialize(self, instance):
         return self.serializer(instance=instance).data
@@ -287,13 +400,13 @@ class ListMixin:
     serializer = None
 
     def get_queryset(self):
-        return getattr(self.model, settings.MODEL_MANAGER)
+        return get_model_manager(self.model)
 
     def serialize(self, instance):
         return self.serializer(instance=instance).data
 
 
-class BaseHandler:
+class BaseHandler(metaclass=HandlerMeta):
 
     # type hints
     user: Any
@@ -305,13 +418,21 @@ class BaseHandler:
     file: dict
 
     event: dict
-    error: Union[list, tuple]
+    # (message, status_code) or (message, status_code, field)
+    error: Union[list, tuple] = PipelineError()
     force_error: bool
     headers: dict
     is_base64: bool
 
     success_code = 200
 
+    # Dependencies between pipeline steps, as a dict mapping the attribute of a
+    # step to the attributes of the steps it needs, e.g.
+    # {"user": (), "queryset": (), "object": ("queryset",)}. When set, steps
+    # whose dependencies are met run concurrently on a shared thread pool. Steps
+    # not listed depend on all the previous ones.
+    pipeline_dependencies: dict = None
+
     def perform_action(self):
         """
         This method is to be overriden. Here is where the particular handler
@@ -319,14 +440,85 @@ class BaseHandler:
         """
         return self.response_body
 
+    @classmethod
+    def get_pipeline(cls) -> Tuple[PipelineStep, ...]:
+        """
+        Returns the steps run by the handler on each invocation, in order, along
+        with the class and function providing each step. The pipeline is
+        computed once per handler class.
+        """
+        pipeline = cls.__dict__.get("_pipeline")
+        if pipeline is None:
+            pipeline = []
+            for attr, method in PIPELINE:
+                if hasattr(cls, method):
+                    provider = cls._get_provider(method)
+                    function = get_step_function(provider, method)
+                    pipeline.append(PipelineStep(attr, method, provider, function))
+            pipeline = cls._pipeline = tuple(pipeline)
+        return pipeline
+
+    @classmethod
+    def get_pipeline_graph(cls) -> Optional[Tuple[frozenset, ...]]:
+        """
+        Returns, for each step of the pipeline, the set of indexes of the steps it
+        depends on according to pipeline_dependencies, or None when the pipeline
+        runs sequentially.
+        """
+        if cls.pipeline_dependencies is None:
+            return None
+        graph = cls.__dict__.get("_pipeline_graph")
+        if graph is None:
+            graph = cls._build_pipeline_graph(
+                cls.get_pipeline(), cls.pipeline_dependencies
+            )
+            cls._pipeline_graph = graph
+        return graph
+
+    @staticmethod
+    def _build_pipeline_graph(pipeline, dependencies):
+        attrs = [step.attr for step in pipeline]
+        graph = []
+        for index, attr in enumerate(attrs):
+            if attr in dependencies:
+                needs = {attrs.index(dep) for dep in dependencies[attr] if dep in attrs}
+            else:
+                needs = set(range(index))
+            graph.append(frozenset(needs))
+
+        # Steps are run as their dependencies complete, reject cycles up front
+        resolved = set()
+        while len(resolved) < len(graph):
+            ready = {i for i, needs in enumerate(graph) if needs <= resolved} - resolved
+            if not ready:
+                unresolved = [attrs[i] for i in range(len(graph)) if i not in resolved]
+                raise ValueError(
+                    f"Circular pipeline dependencies: {', '.join(unresolved)}"
+                )
+            resolved |= ready
+
+        return tuple(graph)
+
+    @classmethod
+    def _get_provider(cls, method):
+        for klass in cls.__mro__:
+            if method in klass.__dict__:
+                return klass
+
     @classmethod
     def as_handler(cls):
         """
         Returns a lambda handler function.
         """
+        # Also rejects circular pipeline_dependencies up front
+        concurrent = cls.get_pipeline_graph() is not None
+        executor = get_executor("pipeline") if concurrent else None
 
         @warmup
         def handler(event, context):
+            # Cached on the class, unless a pipeline method was replaced
+            pipeline = cls.get_pipeline()
+            graph = cls.get_pipeline_graph() if executor is not None else None
             self = cls()
 
             self.event = event
@@ -342,36 +534,98 @@ class BaseHandler:
 
             # set user, queryset, object, body and response_body (that is, if the handler
             # uses the apropiate mixin and the method is avaliable)
-            pairs = [
-                ("body", "get_body"),
-                ("queryparams", "get_queryparams"),
-                ("user", "get_user"),
-                ("queryset", "get_queryset"),
-                ("object", "get_object"),
-                ("messages", "get_messages"),
-                ("file", "get_file"),
-                ("response_body", "perform_action"),
-            ]
-
-            for attr, method in pairs:
-                if hasattr(self, method):
+            if graph is None:
+                for attr, _, _, function in pipeline:
                     try:
-                        setattr(self, attr, getattr(self, method)())
+                        setattr(self, attr, function(self))
                     except Exception as e:
                         if not self.error:
                             tb = traceback.format_exc()
                             return self.render_500_error_response(e, tb)
-                if self.error:
-                    return self.render_error_response(
-                        self.error[0],
-                        self.error[1],
-                        self.error[2] if len(self.error) == 3 else None,
-                    )
+                    if self.error:
+                        return self.render_pipeline_error()
+            else:
+                failure = self._run_pipeline_concurrently(pipeline, graph, executor)
+                if failure is not None:
+                    if failure.error:
+                        self.error = failure.error
+                        return self.render_pipeline_error()
+                    e = failure.exception
+                    tb = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+                    return self.render_500_error_response(e, tb)
 
             return self.render_response(self.response_body, self.success_code)
 
         return handler
 
+    def _run_pipeline_concurrently(self, pipeline, graph, executor):
+        """
+        Run every step as soon as the steps it depends on are done. A step ready
+        on its own runs on the calling thread, concurrent ones on the pool.
+        Once a step fails (raises or sets self.error) no further steps are
+        started, and the StepOutcome of the first failed step in pipeline order
+        is returned, so the response does not depend on which step finished
+        last.
+        """
+        pending = list(range(len(pipeline)))
+        done = set()
+        running = {}
+        failures = {}
+
+        def complete(index, outcome):
+            if outcome.error is None and outcome.exception is None:
+                setattr(self, pipeline[index].attr, outcome.value)
+                done.add(index)
+            else:
+                failures[index] = outcome
+
+        while pending or running:
+            if not failures:
+                ready = [index for index in pending if graph[index] <= done]
+                for index in ready:
+                    pending.remove(index)
+                # Steps run in a copy of the context of the invocation, they see
+                # its context variables (e.g. logging request id) and keep their
+                # own error
+                if len(ready) == 1 and not running:
+                    function = pipeline[ready[0]].function
+                    complete(ready[0], copy_context().run(self._run_step, function))
+                    continue
+                for index in ready:
+                    future = executor.submit(
+                        copy_context().run, self._run_step, pipeline[index].function
+                    )
+                    running[future] = index
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                complete(running.pop(future), future.result())
+
+        return failures[min(failures)] if failures else None
+
+    def _run_step(self, function) -> StepOutcome:
+        """
+        Call the function of a pipeline step, returning its value along with the error it set
+        and the exception it raised, if any. Must run in a context of its own.
+        """
+        state = _StepState(self)
+        _step_state.set(state)
+        try:
+            value = function(self)
+        except Exception as e:
+            return StepOutcome(None, state.error, e)
+        return StepOutcome(value, state.error, None)
+
+    def render_pipeline_error(self):
+        return self.render_error_response(
+            self.error[0],
+            self.error[1],
+            self.error[2] if len(self.error) == 3 else None,
+        )
+
     def render_response(self, body, status_code):
         """
         Given a body and status_code, returns a dictionary in the format of a valid
@@ -423,21 +677,17 @@ class BaseHandler:
 
         logger.exception(e)
 
-        # Log errors in sentry if USE_SENTRY setting variable is set to True.
+        # Log errors in sentry if USE_SENTRY setting variable is set to True. Errors
+        # are sent in the background, and flushed before the invocation returns.
         if settings.USE_SENTRY:
-            sentry_sdk.init(dsn=settings.SENTRY_DNS)
-
-            with configure_scope() as scope:
-
-                if self.user:
-                    scope.user = {"id": self.user.uid, "email": self.user.email}
-
-                scope.set_tag("stage", settings.STAGE)
-                scope.set_extra("class", self.__class__)
-                scope.set_extra("body", self.body)
-                scope.set_extra("event", self.event)
-
-            capture_exception(e)
+            reporter = get_reporter()
+            reporter.report(
+                e,
+                user={"id": self.user.uid, "email": self.user.email} if self.user else None,
+                tags={"stage": settings.STAGE},
+                extras={"class": self.__class__, "body": self.body, "event": self.event},
+            )
+            reporter.flush(get_flush_timeout(self.context))
 
         # Send an 500 error response with traceback and event information in the
         # response body if DEBUG setting variable is set to True.
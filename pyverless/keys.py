@@ -0,0 +1,291 @@
+"""
+Signing and verification keys of JSON web tokens.
+
+A KeyManager prepares the keys once (PEM parsing, JWK decoding...) so signing
+or verifying a token is a dict lookup by 'kid' plus the signature operation.
+Besides the shared secret algorithms, RS256/ES256 and friends are supported
+when the cryptography package is installed, with several keys indexed by 'kid'
+to allow key rotation. Verification keys can also be loaded from a JWKS
+document, read from a file or returned by a fetcher callable and refreshed
+after a time to live.
+
+PyJWT is imported on first use, so importing pyverless does not load it.
+"""
+import base64
+import itertools
+import json
+import threading
+import time
+from typing import Callable, Dict, NamedTuple
+
+from pyverless.config import settings
+from pyverless.exceptions import Unauthorized
+
+# Algorithm used for JWKs not declaring an 'alg'
+DEFAULT_JWK_ALGORITHMS = {
+    "oct": "HS256",
+    "RSA": "RS256",
+    "P-256": "ES256",
+    "P-384": "ES384",
+    "P-521": "ES512",
+}
+
+# Process unique ids of key managers, unlike id() never reused
+_key_manager_uids = itertools.count()
+
+
+class JWTKey(NamedTuple):
+    kid: str
+    algorithm: str
+    # prepared key objects, signing_key is None for verification only keys
+    signing_key: object
+    verification_key: object
+
+
+class KeyManager:
+    """
+    Keys used to sign and verify tokens, indexed by kid. Tokens without a kid
+    header are verified with the signing key. So are tokens with a kid matching
+    no key when the signing key has no kid, as before kids were supported.
+
+    jwks_fetcher is a callable returning a JWKS document (a dict with a 'keys'
+    list). Its keys are loaded on first use, refreshed every jwks_ttl seconds,
+    and on tokens signed with an unknown kid, at most once every
+    jwks_min_refresh_interval seconds.
+    """
+
+    def __init__(
+        self,
+        jwks_fetcher: Callable[[], dict] = None,
+        jwks_ttl: float = 300,
+        jwks_min_refresh_interval: float = 30,
+        timer=time.monotonic,
+    ):
+        self.jwks_fetcher = jwks_fetcher
+        self.jwks_ttl = jwks_ttl
+        self.jwks_min_refresh_interval = jwks_min_refresh_interval
+        self.timer = timer
+        # Unique to the manager, with generation it identifies its current keys
+        self.uid = next(_key_manager_uids)
+        # Incremented whenever the set of keys changes
+        self.generation = 0
+
+        self._keys: Dict[str, JWTKey] = {}
+        self._fetched_kids = set()
+        self._signing_key: JWTKey = None
+        self._fetched_at = None
+        self._lock = threading.Lock()
+
+    def add_key(self, key, algorithm: str, kid: str = None, signing: bool = False):
+        """
+        Add a key given as a secret, a PEM string or a key object. Private keys
+        may be used for signing, their public key is used for verification.
+        """
+        prepared = get_algorithm(algorithm).prepare_key(key)
+        verification_key = prepared
+        if hasattr(prepared, "public_key"):
+            verification_key = prepared.public_key()
+        elif signing and not isinstance(prepared, bytes):
+            raise ValueError("Signing requires a secret or a private key")
+
+        jwt_key = JWTKey(kid, algorithm, prepared if signing else None, verification_key)
+        with self._lock:
+            self._keys[kid] = jwt_key
+            if signing:
+                self._signing_key = jwt_key
+            self.generation += 1
+        return jwt_key
+
+    def load_jwks(self, jwks: dict, fetched: bool = False):
+        """
+        Add the verification keys of a JWKS document.
+        """
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            if jwk.get("use", "sig") != "sig":
+                continue
+            algorithm = jwk.get("alg") or DEFAULT_JWK_ALGORITHMS[
+                jwk.get("crv", jwk["kty"])
+            ]
+            key = key_from_jwk(jwk)
+            if hasattr(key, "public_key"):
+                key = key.public_key()
+            keys[jwk.get("kid")] = JWTKey(jwk.get("kid"), algorithm, None, key)
+
+        with self._lock:
+            if fetched:
+                # Keys missing from a refreshed document are no longer valid
+                for kid in self._fetched_kids - set(keys):
+                    self._keys.pop(kid, None)
+                self._fetched_kids = set(keys)
+            self._keys.update(keys)
+            self.generation += 1
+
+    def load_jwks_file(self, path: str):
+        with open(path) as jwks_file:
+            self.load_jwks(json.load(jwks_file))
+
+    def refresh_jwks(self, force: bool = False) -> bool:
+        """
+        Fetch the JWKS document if its time to live expired, or when forced and
+        the last fetch is older than jwks_min_refresh_interval.
+        """
+        if self.jwks_fetcher is None:
+            return False
+        now = self.timer()
+        if self._fetched_at is not None:
+            age = now - self._fetched_at
+            if age < (self.jwks_min_refresh_interval if force else self.jwks_ttl):
+                return False
+        self._fetched_at = now
+        self.load_jwks(self.jwks_fetcher(), fetched=True)
+        return True
+
+    def get_signing_key(self) -> JWTKey:
+        if self._signing_key is None:
+            raise ValueError("No signing key configured")
+        return self._signing_key
+
+    def get_verification_key(self, kid: str = None) -> JWTKey:
+        self.refresh_jwks()
+        if kid is None:
+            if self._signing_key is not None:
+                return self._signing_key
+        jwt_key = self._keys.get(kid)
+        if jwt_key is None and self.refresh_jwks(force=True):
+            jwt_key = self._keys.get(kid)
+        if jwt_key is None and self._signing_key is not None:
+            if self._signing_key.kid is None:
+                jwt_key = self._signing_key
+        if jwt_key is None:
+            raise Unauthorized()
+        return jwt_key
+
+    def encode(self, payload: dict) -> str:
+        import jwt
+
+        jwt_key = self.get_signing_key()
+        headers = {"kid": jwt_key.kid} if jwt_key.kid is not None else None
+        return jwt.encode(
+            payload, jwt_key.signing_key, jwt_key.algorithm, headers=headers
+        ).decode("utf-8")
+
+    def decode(self, token, leeway=0) -> dict:
+        import jwt
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        jwt_key = self.get_verification_key(kid)
+        return jwt.decode(
+            token,
+            jwt_key.verification_key,
+            leeway=leeway,
+            algorithms=[jwt_key.algorithm],
+        )
+
+
+def get_algorithm(algorithm: str):
+    from jwt.algorithms import get_default_algorithms
+
+    try:
+        return get_default_algorithms()[algorithm]
+    except KeyError:
+        raise ValueError(
+            f"Algorithm {algorithm} not available, asymmetric algorithms require "
+            f"the cryptography package"
+        )
+
+
+def key_from_jwk(jwk: dict):
+    """
+    Return the key object of a JWK.
+    """
+    if jwk["kty"] == "oct":
+        return base64url_decode(jwk["k"])
+    if jwk["kty"] == "RSA":
+        return get_algorithm("RS256").from_jwk(json.dumps(jwk))
+    if jwk["kty"] == "EC":
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        curve = {"P-256": ec.SECP256R1, "P-384": ec.SECP384R1, "P-521": ec.SECP521R1}[
+            jwk["crv"]
+        ]()
+        if "d" in jwk:
+            return ec.derive_private_key(
+                base64url_to_int(jwk["d"]), curve, default_backend()
+            )
+        numbers = ec.EllipticCurvePublicNumbers(
+            base64url_to_int(jwk["x"]), base64url_to_int(jwk["y"]), curve
+        )
+        return numbers.public_key(default_backend())
+    raise ValueError(f"Unsupported JWK key type {jwk['kty']}")
+
+
+def base64url_decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def base64url_to_int(value: str) -> int:
+    return int.from_bytes(base64url_decode(value), "big")
+
+
+def create_key_manager() -> KeyManager:
+    """
+    Build a KeyManager from the settings: JWT_ALGORITHM with SECRET_KEY for
+    shared secret algorithms, or JWT_PRIVATE_KEY / JWT_PUBLIC_KEY (PEM) for
+    asymmetric ones, JWT_KID, and the keys of the JWKS file JWT_JWKS_FILE.
+    """
+    manager = KeyManager()
+    algorithm = settings.JWT_ALGORITHM
+    kid = settings.JWT_KID
+
+    if algorithm.startswith("HS"):
+        manager.add_key(settings.SECRET_KEY, algorithm, kid=kid, signing=True)
+    elif settings.JWT_PRIVATE_KEY:
+        manager.add_key(settings.JWT_PRIVATE_KEY, algorithm, kid=kid, signing=True)
+    elif settings.JWT_PUBLIC_KEY:
+        manager.add_key(settings.JWT_PUBLIC_KEY, algorithm, kid=kid)
+
+    if settings.JWT_JWKS_FILE:
+        manager.load_jwks_file(settings.JWT_JWKS_FILE)
+
+    return manager
+
+
+_key_manager = None
+_key_manager_settings = None
+_custom_key_manager = None
+
+
+def get_key_manager() -> KeyManager:
+    """
+    Return the key manager used by pyverless.crypto. Unless one is installed
+    with set_key_manager, it is built from the settings once, and rebuilt only
+    if the key settings change.
+    """
+    global _key_manager, _key_manager_settings
+
+    if _custom_key_manager is not None:
+        return _custom_key_manager
+
+    key_settings = (
+        settings.JWT_ALGORITHM,
+        settings.SECRET_KEY,
+        settings.JWT_KID,
+        settings.JWT_PRIVATE_KEY,
+        settings.JWT_PUBLIC_KEY,
+        settings.JWT_JWKS_FILE,
+    )
+    if _key_manager is None or key_settings != _key_manager_settings:
+        _key_manager = create_key_manager()
+        _key_manager_settings = key_settings
+    return _key_manager
+
+
+def set_key_manager(manager: KeyManager = None):
+    """
+    Install a key manager, for example one with a JWKS fetcher. None restores
+    the key manager built from the settings.
+    """
+    global _custom_key_manager
+    _custom_key_manager = manager
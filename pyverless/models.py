@@ -1,14 +1,111 @@
 import importlib
 from pyverless.config import settings
+from pyverless.utils.cache import MISSING, TTLCache
+
+# Users by uid, kept USER_CACHE_TTL seconds (unknown uids USER_CACHE_NEGATIVE_TTL
+# seconds). Disabled unless USER_CACHE_SIZE is set.
+user_cache = TTLCache(
+    max_size=int(settings.USER_CACHE_SIZE), ttl=float(settings.USER_CACHE_TTL)
+)
+
+
+# Model classes by dotted path
+_models = {}
+
+
+def import_model(path):
+    """
+    Returns the class at a dotted path. The module is imported and the class
+    looked up on the first call only.
+    """
+    model = _models.get(path)
+    if model is None:
+        module, name = path.rsplit('.', 1)
+        model = _models[path] = getattr(importlib.import_module(module), name)
+    return model
+
+
+def get_model_manager(model):
+    """
+    Returns the MODEL_MANAGER of a model class (or lazy_model). The manager is
+    looked up on every call, as some ORMs return a new stateful manager on each
+    access (e.g. neomodel NodeSet, which filters and slices in place).
+    """
+    if isinstance(model, LazyModel):
+        model = model.resolve()
+    return getattr(model, settings.MODEL_MANAGER)
+
+
+class LazyModel:
+    """
+    Stand-in for the model class at a dotted path, which is imported on first
+    use (attribute access or call). Use it through lazy_model.
+    """
+
+    def __init__(self, path):
+        self._path = path
+
+    def resolve(self):
+        return import_model(self._path)
+
+    def __getattr__(self, name):
+        if name == '_path':
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return '<LazyModel %s>' % self._path
+
+
+def lazy_model(path):
+    """
+    Defer importing a model, e.g. `model = lazy_model('app.models.Book')` on a
+    handler, so the ORM is imported by the first invocation instead of at cold
+    start.
+    """
+    return LazyModel(path)
 
 
 def get_user_model():
-    try:
-        module, user_model = settings.USER_MODEL.rsplit('.', 1)
-    except AttributeError:
+    path = settings.USER_MODEL
+    if not isinstance(path, str) or '.' not in path:
         raise AttributeError('USER_MODEL configuration variable not set or invalid')
-    return getattr(importlib.import_module(module), user_model)
+    return import_model(path)
 
 
 def get_user_by_email(email):
-    return getattr(get_user_model(), settings.MODEL_MANAGER).get_or_none(email=email)
+    return get_model_manager(get_user_model()).get_or_none(email=email)
+
+
+def get_user_by_uid(uid):
+    """
+    Returns the user with the given uid, None if there is none. When the user
+    cache is enabled, users may be returned from it: handlers updating or
+    deleting users should call invalidate_user.
+    """
+    use_cache = user_cache.max_size > 0
+    if use_cache:
+        user = user_cache.get(uid)
+        if user is not MISSING:
+            return user
+
+    user = get_model_manager(get_user_model()).get_or_none(uid=uid)
+
+    if use_cache:
+        ttl = None if user else float(settings.USER_CACHE_NEGATIVE_TTL)
+        user_cache.set(uid, user, ttl=ttl)
+    return user
+
+
+def invalidate_user(uid):
+    """
+    Remove a user from the user cache.
+    """
+    user_cache.delete(uid)
+
+
+def clear_user_cache():
+    user_cache.clear()
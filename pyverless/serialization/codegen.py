@@ -0,0 +1,250 @@
+"""
+Code generation for input serializer trees.
+
+compile_serializer walks a Serializer class and emits one Python function per
+Serializer schema found in the tree. Checks for the built-in serializers are
+inlined into those functions, so a payload is validated without going through
+the serialize -> validate_data -> transform_data chain of every field. Raised
+SerializationError messages are the same as the ones of the serializers.
+
+Serializers that override serialize, validate_data or transform_data can not be
+inlined and are called through their serialize method.
+"""
+import linecache
+import uuid
+from typing import Dict, List, Type
+
+from pyverless.serialization.input_serializer import (
+    BaseSerializer,
+    BooleanSerializer,
+    DateSerializer,
+    EnumSerializer,
+    FloatSerializer,
+    IntegerSerializer,
+    ListSerializer,
+    SerializationError,
+    Serializer,
+    StringSerializer,
+    TimeSerializer,
+    UuidSerializer,
+    is_valid_uuid,
+    parse_date,
+    parse_time,
+)
+
+NULL_ERROR = "Null value in Data is not allowed"
+
+TYPE_CHECKS = {
+    StringSerializer: ("type({value}) != str", "Data is not a string"),
+    IntegerSerializer: ("type({value}) != int", "Data is not a integer"),
+    FloatSerializer: ("type({value}) not in (float, int)", "Data is not a decimal"),
+    BooleanSerializer: ("type({value}) != bool", "Data is not a boolean"),
+    TimeSerializer: ("type({value}) != str", "Data is not a string"),
+    DateSerializer: ("type({value}) != str", "Data is not a string"),
+    EnumSerializer: ("type({value}) != str", "Data is not a string"),
+    UuidSerializer: ("type({value}) != str", "Data is not a string"),
+}
+
+
+class CompiledSerializer:
+    """
+    Callable wrapping the generated function of a Serializer class. The
+    generated code is available on the 'source' attribute.
+    """
+
+    def __init__(self, serializer_class: Type[Serializer], function, source: str):
+        self.serializer_class = serializer_class
+        self.function = function
+        self.source = source
+
+    def __call__(self, input_data):
+        return self.function(input_data)
+
+    def __repr__(self):
+        return f"<CompiledSerializer {self.serializer_class.__qualname__}>"
+
+
+def compile_serializer(serializer_class: Type[Serializer]) -> CompiledSerializer:
+    """
+    Generate the validator function of serializer_class. The returned callable
+    expects a non null input, null handling of the root is left to the caller.
+    """
+    generator = CodeGenerator()
+    function_name = generator.add_schema(serializer_class)
+    source = generator.get_source()
+
+    filename = f"<pyverless-codegen {serializer_class.__qualname__}>"
+    namespace = dict(generator.namespace)
+    exec(compile(source, filename, "exec"), namespace)
+    # Register the source so tracebacks through generated code show the lines
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    return CompiledSerializer(serializer_class, namespace[function_name], source)
+
+
+def can_inline_schema(serializer: BaseSerializer) -> bool:
+    serializer_class = type(serializer)
+    return (
+        isinstance(serializer, Serializer)
+        and not serializer.has_instance_fields()
+        and serializer_class.serialize is Serializer.serialize
+        and serializer_class.validate_data is Serializer.validate_data
+        and serializer_class.transform_data is Serializer.transform_data
+    )
+
+
+class CodeGenerator:
+    def __init__(self):
+        self.namespace = {
+            "SerializationError": SerializationError,
+            "_parse_time": parse_time,
+            "_parse_date": parse_date,
+            "_is_valid_uuid": is_valid_uuid,
+            "_UUID": uuid.UUID,
+        }
+        self.functions: Dict[type, str] = {}
+        self.blocks: List[str] = []
+        self.counter = 0
+
+    def get_source(self) -> str:
+        return "\n\n".join(self.blocks)
+
+    def new_name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}_{self.counter}"
+
+    def bind(self, prefix: str, obj) -> str:
+        name = self.new_name(prefix)
+        self.namespace[name] = obj
+        return name
+
+    def add_schema(self, serializer_class: Type[Serializer]) -> str:
+        """
+        Emit the function validating serializer_class and return its name.
+        """
+        if serializer_class in self.functions:
+            return self.functions[serializer_class]
+
+        function_name = self.new_name(f"serialize_{serializer_class.__name__}")
+        # Registered before emitting the body so recursive schemas resolve
+        self.functions[serializer_class] = function_name
+
+        lines = [
+            f"def {function_name}(data):",
+            "    if type(data) != dict:",
+            '        raise SerializationError("Data is not a dictionary")',
+            "    result = {}",
+        ]
+        for field_name, serializer, required in serializer_class.get_field_plan():
+            lines.append("    try:")
+            lines.append(f"        if {field_name!r} in data:")
+            lines.append(f"            value = data[{field_name!r}]")
+            self.emit(serializer, "value", f"result[{field_name!r}]", lines, 3)
+            if required:
+                lines.append("        else:")
+                lines.append('            raise SerializationError("Data is mandatory")')
+            lines.append("    except Exception as ex:")
+            lines.append(
+                f"        raise SerializationError({f'Field: {field_name} Error: '!r} + str(ex))"
+            )
+        if serializer_class.output_class is None and not serializer_class.slotted_output:
+            lines.append("    return result")
+        else:
+            build_output = self.bind("build_output", serializer_class.build_output)
+            lines.append(f"    return {build_output}(result)")
+
+        self.blocks.append("\n".join(lines) + "\n")
+        return function_name
+
+    def emit(self, serializer, value: str, target: str, lines: List[str], indent: int):
+        """
+        Append the lines validating the variable 'value' against serializer and
+        assigning the output to 'target'.
+        """
+        pad = "    " * indent
+
+        if not self.can_inline(serializer):
+            name = self.bind("serializer", serializer)
+            lines.append(f"{pad}{target} = {name}.serialize({value})")
+            return
+
+        lines.append(f"{pad}if {value} is None:")
+        if serializer.nullable:
+            lines.append(f"{pad}    {target} = None")
+        else:
+            lines.append(f"{pad}    raise SerializationError({NULL_ERROR!r})")
+        lines.append(f"{pad}else:")
+        self.emit_not_null(serializer, value, target, lines, indent + 1)
+
+    def can_inline(self, serializer) -> bool:
+        serializer_class = type(serializer)
+        return (
+            serializer_class in TYPE_CHECKS
+            or (
+                serializer_class is ListSerializer
+                and serializer.output == "list"
+                and not serializer.lazy
+            )
+            or serializer_class is BaseSerializer
+            or can_inline_schema(serializer)
+        )
+
+    def emit_not_null(self, serializer, value, target, lines, indent):
+        pad = "    " * indent
+        serializer_class = type(serializer)
+
+        if serializer_class is BaseSerializer:
+            lines.append(f"{pad}{target} = {value}")
+            return
+
+        if serializer_class is ListSerializer:
+            result = self.new_name("items")
+            item = self.new_name("item")
+            lines.append(f"{pad}if type({value}) != list:")
+            lines.append(f'{pad}    raise SerializationError("Data is not a list")')
+            lines.append(f"{pad}{result} = []")
+            lines.append(f"{pad}for {item} in {value}:")
+            output = self.new_name("output")
+            self.emit(serializer._items_serializer, item, output, lines, indent + 1)
+            lines.append(f"{pad}    {result}.append({output})")
+            lines.append(f"{pad}{target} = {result}")
+            return
+
+        if serializer_class not in TYPE_CHECKS:
+            function_name = self.add_schema(serializer_class)
+            lines.append(f"{pad}{target} = {function_name}({value})")
+            return
+
+        check, message = TYPE_CHECKS[serializer_class]
+        lines.append(f"{pad}if {check.format(value=value)}:")
+        lines.append(f"{pad}    raise SerializationError({message!r})")
+
+        if serializer_class is FloatSerializer:
+            lines.append(f"{pad}{target} = float({value})")
+        elif serializer_class is TimeSerializer:
+            lines.append(f"{pad}try:")
+            lines.append(f"{pad}    {target} = _parse_time({value})")
+            lines.append(f"{pad}except Exception:")
+            lines.append(f'{pad}    raise SerializationError("Data not have the format H:M")')
+        elif serializer_class is DateSerializer:
+            lines.append(f"{pad}try:")
+            lines.append(f"{pad}    {target} = _parse_date({value})")
+            lines.append(f"{pad}except Exception:")
+            lines.append(f'{pad}    raise SerializationError("Data not have the format Y-M-D")')
+        elif serializer_class is EnumSerializer:
+            members = self.bind("members", serializer._members)
+            lines.append(f"{pad}if {value} not in {members}:")
+            lines.append(
+                f"{pad}    raise SerializationError("
+                f"'Data is not an available option, options are ' + ','.join({members}))"
+            )
+            lines.append(f"{pad}{target} = {members}[{value}]")
+        elif serializer_class is UuidSerializer:
+            lines.append(f"{pad}if not _is_valid_uuid({value}):")
+            lines.append(f'{pad}    raise SerializationError("Uuid is not valid")')
+            if serializer.as_uuid:
+                lines.append(f"{pad}{target} = _UUID({value})")
+            else:
+                lines.append(f"{pad}{target} = {value}")
+        else:
+            lines.append(f"{pad}{target} = {value}")
@@ -1,8 +1,13 @@
+import re
 import uuid
 from abc import ABC, abstractmethod
-from datetime import datetime
+from array import array
+from collections.abc import Iterator
+from dataclasses import make_dataclass
+from datetime import date, datetime, time
+from functools import lru_cache
 from enum import Enum
-from typing import Type, List
+from typing import Any, Type, List, NamedTuple, Tuple
 
 
 class SerializationError(Exception):
@@ -34,8 +39,33 @@ class BaseSerializer(SerializerInterface):
         return input_data
 
 
+class FieldStep(NamedTuple):
+    name: str
+    serializer: BaseSerializer
+    required: bool
+
+
 class Serializer(BaseSerializer):
     optional_fields: List[str] = []
+    # When set, serialize runs a function generated for the whole serializer tree,
+    # see pyverless.serialization.codegen. Ignored by classes overriding
+    # validate_data or transform_data, and instances with their own fields.
+    codegen: bool = False
+    # Output objects instead of dicts: instances of output_class, built with the
+    # serialized fields as keyword arguments, or of a dataclass with __slots__
+    # generated from the serializer fields when slotted_output is set.
+    output_class: type = None
+    slotted_output: bool = False
+
+    def serialize(self, input_data):
+        if (
+            self.codegen
+            and input_data is not None
+            and self.can_use_compiled_serializer()
+            and not self.has_instance_fields()
+        ):
+            return self.get_compiled_serializer()(input_data)
+        return super().serialize(input_data)
 
     def validate_data(self, input_data):
         super().validate_data(input_data)
@@ -45,45 +75,241 @@ class Serializer(BaseSerializer):
     def transform_data(self, input_data):
         input_data = super().transform_data(input_data)
         result = {}
-        for field_name in self._get_serializer_fields():
-            serializer: BaseSerializer = getattr(self, field_name)
+        for field_name, serializer, required in self.get_instance_field_plan():
             try:
                 if field_name in input_data:
                     result[field_name] = serializer.serialize(input_data[field_name])
-                else:
-                    if field_name not in self.optional_fields:
-                        raise SerializationError(f"Data is mandatory")
+                elif required:
+                    raise SerializationError(f"Data is mandatory")
             except Exception as ex:
                 raise SerializationError(f"Field: {field_name} Error: {str(ex)}")
+        return self.build_output(result)
+
+    @classmethod
+    def build_output(cls, result: dict):
+        """
+        Build the output of the serializer from the dict of serialized fields.
+        Missing optional fields are set to None on slotted outputs.
+        """
+        if cls.output_class is not None:
+            return cls.output_class(**result)
+        if cls.slotted_output:
+            return cls.get_slotted_output_class()(
+                *[result.get(step.name) for step in cls.get_field_plan()]
+            )
         return result
 
+    @classmethod
+    def get_slotted_output_class(cls) -> type:
+        """
+        Return the dataclass with __slots__ generated from the serializer fields,
+        created on first use and cached on the class.
+        """
+        output_class = cls.__dict__.get("_slotted_output_class")
+        if output_class is None:
+            names = [step.name for step in cls.get_field_plan()]
+            output_class = make_dataclass(
+                f"{cls.__name__}Data",
+                [(name, Any) for name in names],
+                namespace={"__slots__": tuple(names)},
+            )
+            output_class.__module__ = cls.__module__
+            cls._slotted_output_class = output_class
+        return output_class
+
+    @classmethod
+    def get_field_plan(cls) -> Tuple[FieldStep, ...]:
+        """
+        Return the fields of the serializer as a tuple of (name, serializer, required)
+        steps. The plan is collected on first use and cached on the class, so
+        inherited fields are resolved once per Serializer subclass.
+        """
+        plan = cls.__dict__.get("_field_plan")
+        if plan is None:
+            plan = cls._compile_field_plan()
+            cls._field_plan = plan
+        return plan
+
+    @classmethod
+    def _compile_field_plan(cls) -> Tuple[FieldStep, ...]:
+        # type.__dir__ lists the attributes in the order of object.__dir__,
+        # unsorted: fields of the class in declaration order, then the ones
+        # inherited from its bases
+        optional_fields = frozenset(cls.optional_fields)
+        return tuple(
+            FieldStep(key, getattr(cls, key), key not in optional_fields)
+            for key in type.__dir__(cls)
+            if not key.startswith("_") and isinstance(getattr(cls, key), BaseSerializer)
+        )
+
+    def has_instance_fields(self) -> bool:
+        """
+        Whether serializer fields or optional_fields are set on the instance, so
+        the fields differ from the ones of the class plan.
+        """
+        return "optional_fields" in self.__dict__ or any(
+            isinstance(value, BaseSerializer) for value in self.__dict__.values()
+        )
+
+    def get_instance_field_plan(self) -> Tuple[FieldStep, ...]:
+        """
+        Return the fields of the instance: the cached plan of the class, unless
+        the instance sets its own fields, which are then collected on each call
+        (instance fields first, as with object.__dir__).
+        """
+        if not self.has_instance_fields():
+            return self.get_field_plan()
+        optional_fields = frozenset(self.optional_fields)
+        return tuple(
+            FieldStep(key, getattr(self, key), key not in optional_fields)
+            for key in self.__dir__()
+            if not key.startswith("_")
+            and isinstance(getattr(self, key), BaseSerializer)
+        )
+
+    @classmethod
+    def can_use_compiled_serializer(cls) -> bool:
+        """
+        Whether the generated validator validates as the class does, that is,
+        the class does not override validate_data or transform_data. Otherwise
+        codegen is ignored. Checked once per class.
+        """
+        supported = cls.__dict__.get("_compiled_serializer_supported")
+        if supported is None:
+            supported = (
+                cls.validate_data is Serializer.validate_data
+                and cls.transform_data is Serializer.transform_data
+            )
+            cls._compiled_serializer_supported = supported
+        return supported
+
+    @classmethod
+    def get_compiled_serializer(cls):
+        """
+        Return the generated validator of the serializer, compiled on first use and
+        cached on the class. Its source can be inspected through the 'source'
+        attribute.
+        """
+        compiled = cls.__dict__.get("_compiled_serializer")
+        if compiled is None:
+            from pyverless.serialization.codegen import compile_serializer
+
+            compiled = compile_serializer(cls)
+            cls._compiled_serializer = compiled
+        return compiled
+
     def _get_serializer_fields(self):
-        keys_to_be_serializers = [
-            key for key in self.__dir__() if not key.startswith("_")
-        ]
-        serializers = [
-            key
-            for key in keys_to_be_serializers
-            if isinstance(getattr(self, key), BaseSerializer)
-        ]
-        return serializers
+        return [step.name for step in self.get_instance_field_plan()]
 
 
 class ListSerializer(BaseSerializer):
-    def __init__(self, items_serializer: SerializerInterface, *args, **kwargs):
+    """
+    Serialize a list validating each item with items_serializer.
+
+    Lists of built-in primitives (integer, float, boolean, string and uuid items)
+    are validated in bulk. Numeric lists may be returned packed instead of as a
+    list with output="array" (array.array) or output="numpy" (numpy.ndarray), in
+    which case the items serializer must not be nullable.
+
+    With lazy=True the serializer returns an iterator validating the items as
+    they are consumed. The input may then be any iterator besides a list, and
+    errors are raised while iterating, reporting the index of the failing item.
+    """
+
+    outputs = ("list", "array", "numpy")
+
+    def __init__(
+        self,
+        items_serializer: SerializerInterface,
+        *args,
+        output: str = "list",
+        lazy: bool = False,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self._items_serializer = items_serializer
 
+        if output not in self.outputs:
+            raise ValueError(f"output must be one of {', '.join(self.outputs)}")
+        if lazy and output != "list":
+            raise ValueError("lazy mode is only available for list output")
+        if output != "list":
+            if type(items_serializer) not in PACKED_TYPECODES:
+                raise ValueError(
+                    f"{output} output is only available for integer, float and "
+                    f"boolean items"
+                )
+            if items_serializer.nullable:
+                raise ValueError(f"{output} output requires non nullable items")
+            if output == "numpy":
+                import numpy  # noqa: F401
+        self.output = output
+        self.lazy = lazy
+
     def validate_data(self, input_data):
         super().validate_data(input_data)
-        if type(input_data) != list:
+        if type(input_data) != list and not (
+            self.lazy and isinstance(input_data, Iterator)
+        ):
             raise SerializationError("Data is not a list")
 
     def transform_data(self, input_data):
         input_data = super().transform_data(input_data)
-        result = [self._items_serializer.serialize(item) for item in input_data]
+        if self.lazy:
+            return self._iterate(input_data)
+        result = None
+        if type(self._items_serializer) in BULK_TYPES:
+            result = self._bulk_transform(input_data)
+        if result is None:
+            result = [self._items_serializer.serialize(item) for item in input_data]
+        if self.output != "list":
+            result = self._pack(result)
         return result
 
+    def _iterate(self, input_data):
+        serialize = self._items_serializer.serialize
+        for index, item in enumerate(input_data):
+            try:
+                yield serialize(item)
+            except Exception as ex:
+                raise SerializationError(f"Item: {index} Error: {str(ex)}")
+
+    def _bulk_transform(self, input_data):
+        """
+        Validate a list of primitives checking the set of item types at once.
+        Returns None when some item does not validate, so the item by item path
+        raises the same error as before.
+        """
+        items_class = type(self._items_serializer)
+        allowed_types = BULK_TYPES[items_class]
+        if self._items_serializer.nullable:
+            allowed_types = allowed_types | {type(None)}
+
+        item_types = set(map(type, input_data))
+        if not item_types <= allowed_types:
+            return None
+
+        if items_class is FloatSerializer and item_types != {float}:
+            return [item if item is None else float(item) for item in input_data]
+        if items_class is UuidSerializer:
+            for item in input_data:
+                if item is not None and not is_valid_uuid(item):
+                    return None
+            if self._items_serializer.as_uuid:
+                return [item if item is None else uuid.UUID(item) for item in input_data]
+        return list(input_data)
+
+    def _pack(self, result):
+        typecode, dtype = PACKED_TYPECODES[type(self._items_serializer)]
+        try:
+            if self.output == "array":
+                return array(typecode, result)
+            import numpy
+
+            return numpy.asarray(result, dtype=dtype)
+        except OverflowError:
+            raise SerializationError("Data is out of the 64-bit range")
+
 
 class StringSerializer(BaseSerializer):
     def validate_data(self, input_data):
@@ -117,11 +343,58 @@ class BooleanSerializer(BaseSerializer):
             raise SerializationError("Data is not a boolean")
 
 
+# Size of the LRU caches of parsed dates and times, repeated values in a payload
+# are parsed once
+PARSE_CACHE_SIZE = 1024
+
+CANONICAL_UUID = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_time(input_data: str) -> time:
+    """
+    Parse a H:M time. Zero padded HH:MM values take the fromisoformat fast path,
+    anything else goes through strptime.
+    """
+    if len(input_data) == 5 and input_data[2] == ":":
+        try:
+            return time.fromisoformat(input_data)
+        except ValueError:
+            pass
+    return datetime.strptime(input_data, "%H:%M").time()
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date(input_data: str) -> date:
+    """
+    Parse a Y-M-D date. Zero padded YYYY-MM-DD values take the fromisoformat fast
+    path, anything else goes through strptime.
+    """
+    if len(input_data) == 10 and input_data[4] == "-" and input_data[7] == "-":
+        try:
+            return date.fromisoformat(input_data)
+        except ValueError:
+            pass
+    return datetime.strptime(input_data, "%Y-%m-%d").date()
+
+
+def is_valid_uuid(input_data: str) -> bool:
+    if CANONICAL_UUID.fullmatch(input_data):
+        return True
+    try:
+        uuid.UUID(input_data, version=4)
+    except ValueError:
+        return False
+    return True
+
+
 class TimeSerializer(StringSerializer):
     def transform_data(self, input_data):
         input_data = super().transform_data(input_data)
         try:
-            input_data = datetime.strptime(input_data, "%H:%M").time()
+            input_data = parse_time(input_data)
         except Exception:
             raise SerializationError("Data not have the format H:M")
         return input_data
@@ -131,7 +404,7 @@ class DateSerializer(StringSerializer):
     def transform_data(self, input_data):
         input_data = super().transform_data(input_data)
         try:
-            input_data = datetime.strptime(input_data, "%Y-%m-%d").date()
+            input_data = parse_date(input_data)
         except Exception:
             raise SerializationError("Data not have the format Y-M-D")
         return input_data
@@ -141,25 +414,55 @@ class EnumSerializer(StringSerializer):
     def __init__(self, enum_item: Type[Enum], *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._enum_item = enum_item
+        self._members = {enum_option.value: enum_option for enum_option in enum_item}
 
     def validate_data(self, input_data):
         super().validate_data(input_data)
-        choices = [enum_option.value for enum_option in self._enum_item]
-        if input_data not in choices:
+        if input_data not in self._members:
             raise SerializationError(
-                f"Data is not an available option, options are {','.join(choices)}"
+                f"Data is not an available option, options are {','.join(self._members)}"
             )
 
     def transform_data(self, input_data):
         input_data = super().transform_data(input_data)
-        input_data = self._enum_item(input_data)
+        input_data = self._members[input_data]
         return input_data
 
 
 class UuidSerializer(StringSerializer):
+    """
+    Validate an uuid string. With as_uuid=True the value is returned as an
+    uuid.UUID instead of the input string.
+    """
+
+    def __init__(self, *args, as_uuid: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.as_uuid = as_uuid
+
     def validate_data(self, input_data):
         super().validate_data(input_data)
-        try:
-            uuid.UUID(input_data, version=4)
-        except ValueError:
+        if not is_valid_uuid(input_data):
             raise SerializationError("Uuid is not valid")
+
+    def transform_data(self, input_data):
+        input_data = super().transform_data(input_data)
+        if self.as_uuid:
+            input_data = uuid.UUID(input_data)
+        return input_data
+
+
+# Item types accepted by the bulk path of ListSerializer, per items serializer
+BULK_TYPES = {
+    IntegerSerializer: frozenset({int}),
+    FloatSerializer: frozenset({float, int}),
+    BooleanSerializer: frozenset({bool}),
+    StringSerializer: frozenset({str}),
+    UuidSerializer: frozenset({str}),
+}
+
+# (array.array typecode, numpy dtype) of packed ListSerializer outputs
+PACKED_TYPECODES = {
+    IntegerSerializer: ("q", "int64"),
+    FloatSerializer: ("d", "float64"),
+    BooleanSerializer: ("b", "bool"),
+}
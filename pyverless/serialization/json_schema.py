@@ -0,0 +1,152 @@
+"""
+Export input serializer trees as JSON Schema (draft-04) documents.
+
+The exported schemas can be used as API Gateway request models, so malformed
+requests are rejected by API Gateway request validators before the lambda is
+invoked. An exported schema never rejects a payload the serializer accepts, but
+some checks can not be expressed and are left to the serializer: calendar
+validity of dates, the exact syntax of uuids (only their characters and length
+are checked), digits of dates and times outside ASCII, and serializers
+overriding serialize, validate_data or transform_data, which accept any value.
+"""
+from typing import Union, Type
+
+from pyverless.serialization.input_serializer import (
+    BaseSerializer,
+    BooleanSerializer,
+    DateSerializer,
+    EnumSerializer,
+    FloatSerializer,
+    IntegerSerializer,
+    ListSerializer,
+    Serializer,
+    StringSerializer,
+    TimeSerializer,
+    UuidSerializer,
+)
+
+DRAFT_04 = "http://json-schema.org/draft-04/schema#"
+
+# Patterns matching (a superset of) the values accepted by the strptime formats
+# and uuid.UUID. strptime matches any unicode decimal digit with \d, which JSON
+# Schema regular expressions can not express, so any non ASCII character is
+# accepted where a digit is.
+DIGIT = r"(?:[0-9]|[^\x00-\x7f])"
+TIME_PATTERN = rf"^(2[0-3]|[01]{DIGIT}|{DIGIT}):([0-5]{DIGIT}|{DIGIT})$"
+DATE_PATTERN = (
+    rf"^{DIGIT}{{4}}-(1[0-2]|0[1-9]|[1-9])-(3[01]|[12]{DIGIT}|0[1-9]|[1-9]| [1-9])$"
+)
+# uuid.UUID removes 'urn:', 'uuid:', braces and dashes, then parses the 32
+# remaining characters with int(value, 16), which also accepts whitespace, a
+# sign, a 0x prefix, underscores and unicode digits. Only the characters are
+# checked, along with the minimum length.
+UUID_PATTERN = r"^([0-9a-fA-F{}_+xXurnid:\s\x1c-\x1f-]|[^\x00-\x7f])*$"
+UUID_MIN_LENGTH = 32
+
+PRIMITIVE_SCHEMAS = {
+    BaseSerializer: {},
+    StringSerializer: {"type": "string"},
+    IntegerSerializer: {"type": "integer"},
+    FloatSerializer: {"type": "number"},
+    BooleanSerializer: {"type": "boolean"},
+    TimeSerializer: {"type": "string", "pattern": TIME_PATTERN},
+    DateSerializer: {"type": "string", "pattern": DATE_PATTERN},
+    UuidSerializer: {
+        "type": "string",
+        "pattern": UUID_PATTERN,
+        "minLength": UUID_MIN_LENGTH,
+    },
+}
+
+
+def to_json_schema(serializer: Union[BaseSerializer, Type[Serializer]]) -> dict:
+    """
+    Return the JSON Schema document of a serializer instance or Serializer class.
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+    return {"$schema": DRAFT_04, **get_schema(serializer, ())}
+
+
+def to_api_gateway_model(
+    serializer: Union[BaseSerializer, Type[Serializer]], title: str = None
+) -> dict:
+    """
+    Return the schema of an API Gateway REST API model validating request bodies
+    with the serializer. The title defaults to the serializer class name.
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+    if title is None:
+        title = type(serializer).__name__
+    schema = to_json_schema(serializer)
+    return {"$schema": schema.pop("$schema"), "title": title, **schema}
+
+
+def get_schema(serializer: BaseSerializer, parents: tuple) -> dict:
+    serializer_class = type(serializer)
+
+    if is_plain(serializer, Serializer):
+        if serializer_class in parents:
+            raise ValueError(
+                f"Recursive serializer {serializer_class.__name__} can not be exported"
+            )
+        properties = {}
+        required = []
+        for field_name, field_serializer, field_required in (
+            serializer.get_instance_field_plan()
+        ):
+            properties[field_name] = get_schema(
+                field_serializer, parents + (serializer_class,)
+            )
+            if field_required:
+                required.append(field_name)
+        schema = {"type": "object", "properties": properties}
+        if required:
+            schema["required"] = required
+
+    elif is_plain(serializer, ListSerializer):
+        schema = {
+            "type": "array",
+            "items": get_schema(serializer._items_serializer, parents),
+        }
+
+    elif is_plain(serializer, EnumSerializer):
+        choices = [value for value in serializer._members if type(value) == str]
+        if not choices:
+            # No string option, only null may be accepted
+            return {"type": "null"} if serializer.nullable else {"not": {}}
+        schema = {"type": "string", "enum": choices}
+
+    else:
+        for primitive_class, primitive_schema in PRIMITIVE_SCHEMAS.items():
+            if is_plain(serializer, primitive_class):
+                schema = dict(primitive_schema)
+                break
+        else:
+            # Unknown validation, accept anything and leave it to the serializer
+            return {}
+
+    return set_nullable(schema, serializer.nullable)
+
+
+def is_plain(serializer: BaseSerializer, serializer_class: type) -> bool:
+    """
+    Whether serializer validates exactly as serializer_class does, that is,
+    it is an instance of a subclass not overriding its validation methods.
+    """
+    return isinstance(serializer, serializer_class) and all(
+        getattr(type(serializer), method) is getattr(serializer_class, method)
+        for method in ("serialize", "validate_data", "transform_data")
+    )
+
+
+def set_nullable(schema: dict, nullable: bool) -> dict:
+    if "type" not in schema:
+        return schema if nullable else {"not": {"type": "null"}, **schema}
+
+    if nullable:
+        schema["type"] = [schema["type"], "null"]
+        if "enum" in schema:
+            schema["enum"] = schema["enum"] + [None]
+    return schema
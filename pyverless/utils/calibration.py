@@ -0,0 +1,169 @@
+"""
+Calibration of the cost of password hashers.
+
+Hashing cost translates into very different latencies depending on the CPU,
+which for lambdas scales with the memory size. This measures the hashers on the
+current machine and recommends the highest cost verifying a password within a
+target latency. Run it on a lambda of the deployed memory size:
+
+    python -m pyverless.utils.calibration --target-ms 100
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import NamedTuple
+
+from pyverless.crypto import PBKDF2PasswordHasher, ScryptPasswordHasher
+
+PASSWORD = "calibration-password"
+SALT = "calibrationsalt"
+# Memory scrypt may use outside lambdas, in bytes
+DEFAULT_MAX_MEMORY = 64 * 2 ** 20
+
+
+class Calibration(NamedTuple):
+    algorithm: str
+    # Cost parameters, as accepted by the encode method of the hasher
+    params: dict
+    # Time to verify a password with these parameters
+    seconds: float
+    # Why the calibration stopped before reaching the target, if it did
+    note: str = None
+
+
+def measure(function, repeat=3):
+    """
+    Median time of a call to function, in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def calibrate_pbkdf2(target, hasher=None, step=1000, repeat=3):
+    """
+    Highest number of PBKDF2 iterations (a multiple of step) verifying a
+    password within target seconds.
+    """
+    if hasher is None:
+        hasher = PBKDF2PasswordHasher()
+
+    def time_iterations(iterations):
+        return measure(lambda: hasher.encode(PASSWORD, SALT, iterations), repeat)
+
+    # The time is linear in the number of iterations, estimate it from a probe
+    iterations = 10 * step
+    seconds = time_iterations(iterations)
+    iterations = max(int(iterations * target / seconds) // step * step, step)
+    seconds = time_iterations(iterations)
+
+    while seconds > target and iterations > step:
+        estimate = int(iterations * target / seconds) // step * step
+        iterations = max(min(estimate, iterations - step), step)
+        seconds = time_iterations(iterations)
+
+    return Calibration(hasher.algorithm, {"iterations": iterations}, seconds)
+
+
+def get_max_memory():
+    """
+    Memory scrypt may use, in bytes: a quarter of the memory size of the lambda
+    (AWS_LAMBDA_FUNCTION_MEMORY_SIZE, in MB), DEFAULT_MAX_MEMORY elsewhere.
+    """
+    memory_size = os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE")
+    if not memory_size:
+        return DEFAULT_MAX_MEMORY
+    return int(memory_size) * 2 ** 20 // 4
+
+
+def calibrate_scrypt(
+    target, hasher=None, min_work_factor=2 ** 10, repeat=3, max_memory=None
+):
+    """
+    Highest scrypt work factor (a power of 2, with the block size and
+    parallelism of the hasher) verifying a password within target seconds and
+    max_memory bytes (see get_max_memory). When scrypt fails for lack of memory
+    first, the last working parameters are returned.
+    """
+    if hasher is None:
+        hasher = ScryptPasswordHasher()
+    if max_memory is None:
+        max_memory = get_max_memory()
+
+    def time_work_factor(work_factor):
+        return measure(lambda: hasher.encode(PASSWORD, SALT, n=work_factor), repeat)
+
+    work_factor = min_work_factor
+    seconds = time_work_factor(work_factor)
+    note = None
+    while True:
+        # scrypt uses 128 * n * r * p bytes
+        memory = 128 * work_factor * 2 * hasher.block_size * hasher.parallelism
+        if memory > max_memory:
+            note = f"limited by max memory {max_memory // 2 ** 20} MiB"
+            break
+        try:
+            next_seconds = time_work_factor(work_factor * 2)
+        except (ValueError, MemoryError) as e:
+            note = f"limited by scrypt failing with n={work_factor * 2}: {e}"
+            break
+        if next_seconds > target:
+            break
+        work_factor, seconds = work_factor * 2, next_seconds
+
+    params = {"n": work_factor, "r": hasher.block_size, "p": hasher.parallelism}
+    return Calibration(hasher.algorithm, params, seconds, note)
+
+
+def calibrate(target, hashers=None, repeat=3, max_memory=None):
+    """
+    Calibrate each of the hashers (PBKDF2 and scrypt hashers by default).
+    """
+    if hashers is None:
+        hashers = [PBKDF2PasswordHasher(), ScryptPasswordHasher()]
+
+    calibrations = []
+    for hasher in hashers:
+        if isinstance(hasher, PBKDF2PasswordHasher):
+            calibrations.append(calibrate_pbkdf2(target, hasher, repeat=repeat))
+        elif isinstance(hasher, ScryptPasswordHasher):
+            calibrations.append(
+                calibrate_scrypt(target, hasher, repeat=repeat, max_memory=max_memory)
+            )
+        else:
+            raise ValueError(f"Can not calibrate {type(hasher).__name__}")
+    return calibrations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Recommend password hasher costs fitting a verify latency."
+    )
+    parser.add_argument(
+        "--target-ms", type=float, default=100, help="target verify latency"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--max-memory-mb",
+        type=int,
+        help="memory scrypt may use, defaults to a quarter of the lambda memory size",
+    )
+    args = parser.parse_args(argv)
+
+    max_memory = args.max_memory_mb * 2 ** 20 if args.max_memory_mb else None
+    for calibration in calibrate(
+        args.target_ms / 1000, repeat=args.repeat, max_memory=max_memory
+    ):
+        params = ", ".join(f"{name}={value}" for name, value in calibration.params.items())
+        line = f"{calibration.algorithm:<16} {params:<32} {calibration.seconds * 1000:>8.1f} ms"
+        if calibration.note:
+            line += f"  ({calibration.note})"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_executors = {}
+_lock = threading.Lock()
+
+
+def get_executor(name: str = "default", max_workers: int = None) -> ThreadPoolExecutor:
+    """
+    Return the thread pool registered under name, created on first use. Pools
+    are shared by all invocations for the lifetime of the container.
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix=f"pyverless-{name}"
+                )
+                _executors[name] = executor
+    return executor
@@ -0,0 +1,25 @@
+import importlib
+
+
+def import_string(path: str):
+    """
+    Return the attribute at a dotted path, e.g. 'package.module.Class'.
+    """
+    module, name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module), name)
+
+
+class LazyImport:
+    """
+    Class attribute standing for the attribute at a dotted path, imported the
+    first time it is read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.value = None
+
+    def __get__(self, instance, owner):
+        if self.value is None:
+            self.value = import_string(self.path)
+        return self.value
@@ -1,36 +1,53 @@
-from logging import config, INFO, ERROR
+from contextvars import ContextVar
+from logging import config, Logger, DEBUG, INFO, WARNING, ERROR, CRITICAL
 from os import environ
 
 from pythonjsonlogger.jsonlogger import JsonFormatter
 
+DEFAULT_AWS_REQUEST_ID = "default_aws_request_id"
 
-def initialize_logger(
-    logger_level: str = "DEBUG",
-    environment: str = "dev",
-    sentry_dns: str = None,
-    aws_request_id: str = "default_aws_request_id",
-):
-    formatter_config = {
-        "format": "%(asctime)s : %(levelname)s : %(name)s : %(funcName)s : %(message)s",
-        "datefmt": "%d-%m-%Y %I:%M:%S",
-    }
+# Request id of the invocation being processed, added to every log record
+aws_request_id_var: ContextVar[str] = ContextVar("aws_request_id", default=None)
+
+# Arguments of the configuration applied by configure_logging
+_configuration = None
+
+# Level of the logging methods of loggers
+METHOD_LEVELS = {
+    "debug": DEBUG,
+    "info": INFO,
+    "warning": WARNING,
+    "error": ERROR,
+    "exception": ERROR,
+    "critical": CRITICAL,
+}
 
-    environ["AWS_REQUEST_ID"] = aws_request_id
 
-    class CustomJsonFormatter(JsonFormatter):
-        aws_request_id = None
+class CustomJsonFormatter(JsonFormatter):
+    def add_fields(self, log_record, record, message_dict):
+        super(CustomJsonFormatter, self).add_fields(log_record, record, message_dict)
+        log_record["aws_request_id"] = (
+            aws_request_id_var.get()
+            or environ.get("AWS_REQUEST_ID")
+            or DEFAULT_AWS_REQUEST_ID
+        )
 
-        def add_fields(self, log_record, record, message_dict):
-            super(CustomJsonFormatter, self).add_fields(
-                log_record, record, message_dict
-            )
-            if self.aws_request_id is None and "AWS_REQUEST_ID" in environ:
-                self.aws_request_id = environ["AWS_REQUEST_ID"]
-            log_record["aws_request_id"] = (
-                self.aws_request_id if self.aws_request_id else "default_aws_request_id"
-            )
 
-    formatter_config["()"] = CustomJsonFormatter
+def configure_logging(
+    logger_level: str = "DEBUG",
+    environment: str = "dev",
+    sentry_dns: str = None,
+) -> bool:
+    """
+    Configure the pyverless logger, and sentry when sentry_dns is given. This is
+    meant to run once per container: calls repeating the current configuration
+    return False without doing anything.
+    """
+    global _configuration
+
+    configuration = (logger_level, environment, sentry_dns)
+    if configuration == _configuration:
+        return False
 
     if sentry_dns:
         import sentry_sdk
@@ -61,6 +78,51 @@ def initialize_logger(
                     "level": logger_level,
                 }
             },
-            "formatters": {"formatter_for_pyverless": formatter_config},
+            "formatters": {
+                "formatter_for_pyverless": {
+                    "format": "%(asctime)s : %(levelname)s : %(name)s : %(funcName)s : %(message)s",
+                    "datefmt": "%d-%m-%Y %I:%M:%S",
+                    "()": CustomJsonFormatter,
+                }
+            },
         }
     )
+
+    _configuration = configuration
+    return True
+
+
+def get_enabled_logging_functions(functions) -> list:
+    """
+    Filter out the logger methods (e.g. logger.info) of disabled levels, so log
+    records are only built when some function will log them. Other callables
+    are kept.
+    """
+    enabled = []
+    for function in functions:
+        logger = getattr(function, "__self__", None)
+        level = METHOD_LEVELS.get(getattr(function, "__name__", None))
+        if isinstance(logger, Logger) and level is not None:
+            if not logger.isEnabledFor(level):
+                continue
+        enabled.append(function)
+    return enabled
+
+
+def set_aws_request_id(aws_request_id: str):
+    """
+    Set the request id added to the log records of the current invocation.
+    """
+    aws_request_id_var.set(aws_request_id)
+
+
+def initialize_logger(
+    logger_level: str = "DEBUG",
+    environment: str = "dev",
+    sentry_dns: str = None,
+    aws_request_id: str = DEFAULT_AWS_REQUEST_ID,
+):
+    configure_logging(
+        logger_level=logger_level, environment=environment, sentry_dns=sentry_dns
+    )
+    set_aws_request_id(aws_request_id)
@@ -0,0 +1,209 @@
+"""
+Background error reporting to sentry.
+
+The sentry SDK is initialized once per container, on the first reported error.
+Exceptions are handed to a worker thread through a bounded queue, so the
+request reporting an error does not build and send the sentry event itself, and
+are sampled and rate limited per fingerprint (exception type and the line
+raising it) so an error storm does not flood the queue. flush waits for the
+queued reports within a time budget before the invocation returns.
+"""
+import logging
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+from pyverless.config import settings
+
+logger = logging.getLogger("pyverless")
+
+# Margin left to the lambda after flushing, in seconds
+FLUSH_MARGIN = 0.5
+
+
+class SentryReporter:
+    def __init__(
+        self,
+        dsn: str,
+        max_queue_size: int = 100,
+        rate_limit: int = 10,
+        rate_window: float = 60,
+        sample_rate: float = 1.0,
+        max_fingerprints: int = 1000,
+    ):
+        self.dsn = dsn
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.sample_rate = sample_rate
+        self.max_fingerprints = max_fingerprints
+
+        self.queued = 0
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._occurrences = {}
+        self._pending = 0
+        self._condition = threading.Condition()
+        self._worker = None
+        self._initialized = False
+
+    def report(self, exception, user=None, tags=None, extras=None) -> bool:
+        """
+        Queue the exception to be sent to sentry. Returns False when the report
+        is sampled out, rate limited or the queue is full.
+        """
+        if random.random() >= self.sample_rate or self._is_rate_limited(exception):
+            self.dropped += 1
+            return False
+
+        with self._condition:
+            try:
+                self._queue.put_nowait((exception, user, tags, extras))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self._pending += 1
+            self.queued += 1
+            self._start_worker()
+        return True
+
+    def flush(self, timeout: float) -> bool:
+        """
+        Wait up to timeout seconds for the queued reports to be sent. Returns
+        whether everything was sent in time.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+
+        if not self._initialized:
+            return True
+
+        import sentry_sdk
+
+        sentry_sdk.flush(timeout=max(deadline - time.monotonic(), 0))
+        return True
+
+    def _is_rate_limited(self, exception) -> bool:
+        fingerprint = get_fingerprint(exception)
+        now = time.monotonic()
+
+        with self._condition:
+            occurrences = self._occurrences.get(fingerprint)
+            if occurrences is None:
+                if len(self._occurrences) >= self.max_fingerprints:
+                    self._occurrences.clear()
+                occurrences = self._occurrences[fingerprint] = deque()
+            while occurrences and occurrences[0] <= now - self.rate_window:
+                occurrences.popleft()
+            if len(occurrences) >= self.rate_limit:
+                return True
+            occurrences.append(now)
+        return False
+
+    def _start_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._work, name="pyverless-sentry", daemon=True
+            )
+            self._worker.start()
+
+    def _work(self):
+        while True:
+            exception, user, tags, extras = self._queue.get()
+            try:
+                self._send(exception, user, tags, extras)
+            except Exception:
+                logger.exception("Error reporting to sentry")
+            finally:
+                with self._condition:
+                    self._pending -= 1
+                    self._condition.notify_all()
+
+    def _send(self, exception, user, tags, extras):
+        import sentry_sdk
+
+        if not self._initialized:
+            sentry_sdk.init(dsn=self.dsn)
+            self._initialized = True
+
+        # Scope keyword arguments of capture_exception require sentry-sdk 1.x,
+        # set them on a scope of the report instead
+        with new_scope() as scope:
+            if user:
+                # set_user was added in sentry-sdk 0.13, the setter is deprecated
+                if hasattr(scope, "set_user"):
+                    scope.set_user(user)
+                else:
+                    scope.user = user
+            for key, value in (tags or {}).items():
+                scope.set_tag(key, value)
+            for key, value in (extras or {}).items():
+                scope.set_extra(key, value)
+            sentry_sdk.capture_exception(exception)
+
+
+def new_scope():
+    """
+    Context manager of a scope isolated from the others: new_scope on sentry-sdk
+    2.x, where push_scope is deprecated, push_scope before.
+    """
+    import sentry_sdk
+
+    if hasattr(sentry_sdk, "new_scope"):
+        return sentry_sdk.new_scope()
+    return sentry_sdk.push_scope()
+
+
+def get_fingerprint(exception) -> tuple:
+    """
+    Identify an exception by its type and the line it was raised from.
+    """
+    tb = exception.__traceback__
+    while tb is not None and tb.tb_next is not None:
+        tb = tb.tb_next
+    if tb is None:
+        return (type(exception).__qualname__, None, None)
+    return (type(exception).__qualname__, tb.tb_frame.f_code.co_filename, tb.tb_lineno)
+
+
+def get_flush_timeout(context) -> float:
+    """
+    Time available to flush the reports of an invocation: SENTRY_FLUSH_TIMEOUT,
+    bounded by the remaining time of the lambda minus a safety margin.
+    """
+    timeout = float(settings.SENTRY_FLUSH_TIMEOUT)
+    try:
+        remaining = context.get_remaining_time_in_millis() / 1000
+    except AttributeError:
+        return timeout
+    return max(min(timeout, remaining - FLUSH_MARGIN), 0)
+
+
+_reporter = None
+_reporter_lock = threading.Lock()
+
+
+def get_reporter() -> SentryReporter:
+    """
+    Return the container wide reporter, configured from the settings.
+    """
+    global _reporter
+
+    if _reporter is None:
+        with _reporter_lock:
+            if _reporter is None:
+                _reporter = SentryReporter(
+                    dsn=settings.SENTRY_DNS,
+                    max_queue_size=int(settings.SENTRY_QUEUE_SIZE),
+                    rate_limit=int(settings.SENTRY_RATE_LIMIT),
+                    rate_window=float(settings.SENTRY_RATE_WINDOW),
+                    sample_rate=float(settings.SENTRY_SAMPLE_RATE),
+                )
+    return _reporter
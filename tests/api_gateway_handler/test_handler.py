@@ -163,6 +163,29 @@ class TestApiGatewayHandlerStandalone(unittest.TestCase):
         )
 
 
+class TestLazyEventParsing(unittest.TestCase):
+    def test_event_parsed_for_logs_only_when_enabled(self):
+        parsed = []
+
+        class TestHandler(ApiGatewayHandlerStandalone):
+            @staticmethod
+            def event_parser(event):
+                parsed.append(True)
+                return ApiGatewayHandlerStandalone.event_parser(event)
+
+            def perform_action(self):
+                return {}
+
+        event = create_api_gateway_event(path="test", method="GET")
+
+        output = TestHandler.as_handler(logger_level="WARNING")(event, create_lambda_context())
+        self.assertEqual(output["statusCode"], 200)
+        self.assertEqual(parsed, [])
+
+        TestHandler.as_handler(logger_level="INFO")(event, create_lambda_context())
+        self.assertEqual(parsed, [True])
+
+
 class TestApiGatewayWSHandlerStandalone(unittest.TestCase):
     def test_handler_ok_response(self):
         class TestHandler(ApiGatewayWSHandlerStandalone):
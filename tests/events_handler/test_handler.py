@@ -42,3 +42,33 @@ class TestEventsHandler(unittest.TestCase):
             handler(
                 {}, create_lambda_context()
             )
+
+    def test_lazy_event_parsing(self):
+        parsed = []
+
+        def parser(event):
+            parsed.append(event)
+            return event["test_param"]
+
+        class TestHandler(EventsHandler):
+            event_parser = staticmethod(parser)
+
+            def perform_action(self):
+                if self.event.get("parse"):
+                    return self.event_parsed + self.event_parsed
+                return None
+
+        handler = TestHandler.as_handler(logger_level="WARNING")
+
+        # The event is not parsed unless the handler uses it
+        self.assertIsNone(handler({"test_param": "abc"}, create_lambda_context()))
+        self.assertEqual(parsed, [])
+
+        # and it is parsed once
+        output = handler({"test_param": "abc", "parse": True}, create_lambda_context())
+        self.assertEqual(output, "abcabc")
+        self.assertEqual(len(parsed), 1)
+
+        handler_instance = TestHandler()
+        handler_instance.event_parsed = "set"
+        self.assertEqual(handler_instance.event_parsed, "set")
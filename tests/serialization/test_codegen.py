@@ -0,0 +1,164 @@
+import unittest
+from datetime import date, time
+from enum import Enum
+
+from pyverless.serialization import input_serializer
+from pyverless.serialization.codegen import compile_serializer
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class UpperStringSerializer(input_serializer.StringSerializer):
+    def transform_data(self, input_data):
+        return super().transform_data(input_data).upper()
+
+
+class ChildSerializer(input_serializer.Serializer):
+    optional_fields = ["when"]
+
+    number = input_serializer.IntegerSerializer(nullable=False)
+    when = input_serializer.DateSerializer()
+
+
+class ParentSerializer(input_serializer.Serializer):
+    optional_fields = ["extra"]
+
+    name = input_serializer.StringSerializer()
+    code = UpperStringSerializer()
+    price = input_serializer.FloatSerializer()
+    active = input_serializer.BooleanSerializer()
+    color = input_serializer.EnumSerializer(Color)
+    at = input_serializer.TimeSerializer()
+    uid = input_serializer.UuidSerializer()
+    child = ChildSerializer()
+    children = input_serializer.ListSerializer(
+        items_serializer=ChildSerializer(nullable=False)
+    )
+    matrix = input_serializer.ListSerializer(
+        items_serializer=input_serializer.ListSerializer(
+            items_serializer=input_serializer.IntegerSerializer()
+        )
+    )
+    extra = input_serializer.BaseSerializer()
+
+
+class CodegenParentSerializer(ParentSerializer):
+    codegen = True
+
+
+def valid_payload():
+    return {
+        "name": "name",
+        "code": "abc",
+        "price": 1,
+        "active": True,
+        "color": "red",
+        "at": "10:30",
+        "uid": "0f8d3c3e-2b5e-4a4f-9b1c-7a3e8e2b6c1d",
+        "child": {"number": 1, "when": "2020-01-31"},
+        "children": [{"number": 2}, {"number": 3, "when": None}],
+        "matrix": [[1, 2], [], None, [None]],
+    }
+
+
+def invalid_payloads():
+    for field, value in [
+        ("name", 1),
+        ("code", 1),
+        ("price", "1"),
+        ("active", 1),
+        ("color", "green"),
+        ("color", 1),
+        ("at", "10"),
+        ("uid", "not-an-uuid"),
+        ("child", []),
+        ("child", {"number": None}),
+        ("child", {"number": 1, "when": "31-01-2020"}),
+        ("child", {}),
+        ("children", {}),
+        ("children", [None]),
+        ("children", [{"number": "1"}]),
+        ("matrix", [["1"]]),
+    ]:
+        payload = valid_payload()
+        payload[field] = value
+        yield payload
+    payload = valid_payload()
+    del payload["name"]
+    yield payload
+    yield []
+
+
+class TestCodegen(unittest.TestCase):
+    def test_same_output_as_serializer(self):
+        payload = valid_payload()
+        expected = ParentSerializer().serialize(payload)
+        output = CodegenParentSerializer().serialize(payload)
+
+        self.assertEqual(output, expected)
+        self.assertEqual(output["code"], "ABC")
+        self.assertEqual(output["color"], Color.RED)
+        self.assertEqual(output["at"], time(10, 30))
+        self.assertEqual(output["child"]["when"], date(2020, 1, 31))
+        self.assertIsInstance(output["price"], float)
+
+    def test_same_error_messages_as_serializer(self):
+        serializer = ParentSerializer()
+        compiled = CodegenParentSerializer()
+        for payload in invalid_payloads():
+            with self.assertRaises(input_serializer.SerializationError) as expected:
+                serializer.serialize(payload)
+            with self.assertRaises(input_serializer.SerializationError) as error:
+                compiled.serialize(payload)
+            self.assertEqual(str(error.exception), str(expected.exception))
+
+    def test_root_nullable(self):
+        self.assertIsNone(CodegenParentSerializer().serialize(None))
+        with self.assertRaises(input_serializer.SerializationError):
+            CodegenParentSerializer(nullable=False).serialize(None)
+
+    def test_generated_source(self):
+        compiled = CodegenParentSerializer.get_compiled_serializer()
+
+        self.assertIs(CodegenParentSerializer.get_compiled_serializer(), compiled)
+        # one function per schema
+        self.assertEqual(compiled.source.count("\ndef ") + 1, 2)
+        self.assertIn("def serialize_ChildSerializer", compiled.source)
+        # serializers overriding transform_data are called, not inlined
+        self.assertIn(".serialize(value)", compiled.source)
+
+    def test_slotted_output(self):
+        class SlottedChildSerializer(ChildSerializer):
+            codegen = True
+            slotted_output = True
+
+        output = SlottedChildSerializer().serialize({"number": 1})
+        self.assertIsInstance(output, SlottedChildSerializer.get_slotted_output_class())
+        self.assertEqual((output.number, output.when), (1, None))
+
+    def test_root_overrides(self):
+        class ValidatingSerializer(input_serializer.Serializer):
+            codegen = True
+            a = input_serializer.IntegerSerializer()
+
+            def validate_data(self, input_data):
+                super().validate_data(input_data)
+                if input_data.get("a") == 3:
+                    raise input_serializer.SerializationError("a can not be 3")
+
+            def transform_data(self, input_data):
+                return {**super().transform_data(input_data), "added": True}
+
+        serializer = ValidatingSerializer()
+        self.assertEqual(serializer.serialize({"a": 1}), {"a": 1, "added": True})
+        with self.assertRaises(input_serializer.SerializationError):
+            serializer.serialize({"a": 3})
+        self.assertFalse(ValidatingSerializer.can_use_compiled_serializer())
+        self.assertTrue(CodegenParentSerializer.can_use_compiled_serializer())
+
+    def test_compile_serializer(self):
+        compiled = compile_serializer(ChildSerializer)
+        self.assertEqual(compiled({"number": 1}), {"number": 1})
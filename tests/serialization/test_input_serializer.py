@@ -1,4 +1,8 @@
+import importlib.util
 import unittest
+import uuid
+from array import array
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
@@ -89,6 +93,34 @@ class TestInputSerializer(unittest.TestCase):
         with self.assertRaises(input_serializer.SerializationError):
             serializer.serialize(fake_functions.fake_date_str(str_format="%m-%d"))
 
+    def test_time_and_date_serializer_formats(self):
+        time_serializer = input_serializer.TimeSerializer()
+        date_serializer = input_serializer.DateSerializer()
+
+        for test_input in ["09:05", "9:5", "23:59"]:
+            self.assertEqual(
+                time_serializer.serialize(test_input),
+                datetime.strptime(test_input, "%H:%M").time(),
+            )
+        for test_input in ["2020-01-05", "2020-1-5", "2020-12-31"]:
+            self.assertEqual(
+                date_serializer.serialize(test_input),
+                datetime.strptime(test_input, "%Y-%m-%d").date(),
+            )
+        for test_input in ["24:00", "09:05:00", "T09:05"]:
+            with self.assertRaises(input_serializer.SerializationError):
+                time_serializer.serialize(test_input)
+        for test_input in ["2020-02-30", "20200105", "2020-01-05T00:00"]:
+            with self.assertRaises(input_serializer.SerializationError):
+                date_serializer.serialize(test_input)
+
+    def test_date_serializer_parse_cache(self):
+        input_serializer.parse_date.cache_clear()
+        serializer = input_serializer.DateSerializer()
+        serializer.serialize("2021-06-01")
+        serializer.serialize("2021-06-01")
+        self.assertEqual(input_serializer.parse_date.cache_info().hits, 1)
+
     def test_list_serializer(self):
         serializer = input_serializer.ListSerializer(
             items_serializer=input_serializer.IntegerSerializer()
@@ -111,6 +143,100 @@ class TestInputSerializer(unittest.TestCase):
         with self.assertRaises(input_serializer.SerializationError):
             serializer.serialize([fake_functions.fake_random_word()])
 
+    def test_list_serializer_bulk(self):
+        serializer = input_serializer.ListSerializer(
+            items_serializer=input_serializer.FloatSerializer()
+        )
+        test_input = [1, 2.5, None]
+        result = serializer.serialize(test_input)
+        self.assertEqual(result, [1.0, 2.5, None])
+        self.assertIsInstance(result[0], float)
+        self.assertIsNot(result, test_input)
+
+    def test_list_serializer_bulk_errors(self):
+        for items_serializer, test_input, message in [
+            (input_serializer.IntegerSerializer(), [1, True], "Data is not a integer"),
+            (
+                input_serializer.StringSerializer(nullable=False),
+                ["a", None],
+                "Null value in Data is not allowed",
+            ),
+            (
+                input_serializer.UuidSerializer(),
+                [str(fake_functions.fake_uuid()), "a"],
+                "Uuid is not valid",
+            ),
+        ]:
+            serializer = input_serializer.ListSerializer(
+                items_serializer=items_serializer
+            )
+            with self.assertRaises(input_serializer.SerializationError) as error:
+                serializer.serialize(test_input)
+            self.assertEqual(str(error.exception), message)
+
+    def test_list_serializer_array_output(self):
+        serializer = input_serializer.ListSerializer(
+            items_serializer=input_serializer.IntegerSerializer(nullable=False),
+            output="array",
+        )
+        result = serializer.serialize([1, 2, 3])
+        self.assertEqual(result, array("q", [1, 2, 3]))
+
+        with self.assertRaises(input_serializer.SerializationError):
+            serializer.serialize([2 ** 64])
+
+    def test_list_serializer_array_output_errors(self):
+        with self.assertRaises(ValueError):
+            input_serializer.ListSerializer(
+                items_serializer=input_serializer.IntegerSerializer(), output="array"
+            )
+        with self.assertRaises(ValueError):
+            input_serializer.ListSerializer(
+                items_serializer=input_serializer.StringSerializer(nullable=False),
+                output="array",
+            )
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_list_serializer_numpy_output(self):
+        serializer = input_serializer.ListSerializer(
+            items_serializer=input_serializer.FloatSerializer(nullable=False),
+            output="numpy",
+        )
+        result = serializer.serialize([1, 2.5])
+        self.assertEqual(result.dtype.name, "float64")
+        self.assertEqual(result.tolist(), [1.0, 2.5])
+
+    def test_list_serializer_lazy(self):
+        serializer = input_serializer.ListSerializer(
+            items_serializer=input_serializer.IntegerSerializer(), lazy=True
+        )
+        result = serializer.serialize([1, 2, 3])
+        self.assertNotIsInstance(result, list)
+        self.assertEqual(list(result), [1, 2, 3])
+
+        result = serializer.serialize(iter([4, 5]))
+        self.assertEqual(list(result), [4, 5])
+
+        with self.assertRaises(input_serializer.SerializationError):
+            serializer.serialize({})
+
+    def test_list_serializer_lazy_errors(self):
+        serializer = input_serializer.ListSerializer(
+            items_serializer=input_serializer.IntegerSerializer(), lazy=True
+        )
+        result = serializer.serialize([1, "a", 3])
+        self.assertEqual(next(result), 1)
+        with self.assertRaises(input_serializer.SerializationError) as error:
+            next(result)
+        self.assertEqual(str(error.exception), "Item: 1 Error: Data is not a integer")
+
+        with self.assertRaises(ValueError):
+            input_serializer.ListSerializer(
+                items_serializer=input_serializer.IntegerSerializer(nullable=False),
+                output="array",
+                lazy=True,
+            )
+
     def test_dict_serializer(self):
         class SerializerTest(input_serializer.Serializer):
             test = input_serializer.IntegerSerializer()
@@ -155,6 +281,37 @@ class TestInputSerializer(unittest.TestCase):
         with self.assertRaises(input_serializer.SerializationError):
             serializer.serialize({"test": fake_functions.fake_random_word()})
 
+    def test_dict_serializer_slotted_output(self):
+        class SerializerTest(input_serializer.Serializer):
+            optional_fields = ["test_1"]
+            slotted_output = True
+
+            test = input_serializer.IntegerSerializer()
+            test_1 = input_serializer.IntegerSerializer()
+
+        serializer = SerializerTest()
+        result = serializer.serialize({"test": 1})
+        self.assertIsInstance(result, SerializerTest.get_slotted_output_class())
+        self.assertEqual(result.test, 1)
+        self.assertIsNone(result.test_1)
+        self.assertFalse(hasattr(result, "__dict__"))
+
+    def test_dict_serializer_output_class(self):
+        @dataclass
+        class Output:
+            test: int
+            test_1: int = 0
+
+        class SerializerTest(input_serializer.Serializer):
+            optional_fields = ["test_1"]
+            output_class = Output
+
+            test = input_serializer.IntegerSerializer()
+            test_1 = input_serializer.IntegerSerializer()
+
+        serializer = SerializerTest()
+        self.assertEqual(serializer.serialize({"test": 1}), Output(test=1))
+
     def test_enum_serializer(self):
         class EnumTest(Enum):
             OK = "ok"
@@ -170,8 +327,12 @@ class TestInputSerializer(unittest.TestCase):
             ERROR = "error"
 
         serializer = input_serializer.EnumSerializer(EnumTest)
-        with self.assertRaises(input_serializer.SerializationError):
+        with self.assertRaises(input_serializer.SerializationError) as error:
             serializer.serialize("not found")
+        self.assertEqual(
+            str(error.exception),
+            "Data is not an available option, options are ok,error",
+        )
 
     def test_uuid_serializer(self):
         serializer = input_serializer.UuidSerializer()
@@ -179,8 +340,92 @@ class TestInputSerializer(unittest.TestCase):
         output = serializer.serialize(input_data)
         self.assertEqual(output, input_data)
 
+    def test_uuid_serializer_non_canonical(self):
+        serializer = input_serializer.UuidSerializer()
+        input_data = "{%s}" % fake_functions.fake_uuid().replace("-", "")
+        self.assertEqual(serializer.serialize(input_data), input_data)
+
+    def test_uuid_serializer_as_uuid(self):
+        serializer = input_serializer.UuidSerializer(as_uuid=True)
+        input_data = str(fake_functions.fake_uuid())
+        output = serializer.serialize(input_data)
+        self.assertEqual(output, uuid.UUID(input_data))
+
+        serializer = input_serializer.ListSerializer(items_serializer=serializer)
+        self.assertEqual(serializer.serialize([input_data]), [uuid.UUID(input_data)])
+
     def test_uuid_serializer_error(self):
         serializer = input_serializer.UuidSerializer()
         input_data = fake_functions.fake_random_word()
         with self.assertRaises(input_serializer.SerializationError):
             serializer.serialize(input_data)
+
+    def test_dict_serializer_field_plan(self):
+        class ParentSerializer(input_serializer.Serializer):
+            optional_fields = ["parent"]
+
+            parent = input_serializer.IntegerSerializer()
+
+        class ChildSerializer(ParentSerializer):
+            child = input_serializer.StringSerializer()
+
+        plan = ChildSerializer.get_field_plan()
+        self.assertEqual(
+            [(step.name, step.required) for step in plan],
+            [("child", True), ("parent", False)],
+        )
+        self.assertIs(plan[1].serializer, ParentSerializer.parent)
+        self.assertIs(ChildSerializer.get_field_plan(), plan)
+        self.assertEqual(
+            [step.name for step in ParentSerializer.get_field_plan()], ["parent"]
+        )
+
+    def test_dict_serializer_declaration_order(self):
+        class SerializerTest(input_serializer.Serializer):
+            zeta = input_serializer.IntegerSerializer()
+            alpha = input_serializer.IntegerSerializer()
+
+        serializer = SerializerTest()
+        self.assertEqual(list(serializer.serialize({"alpha": 1, "zeta": 2})), ["zeta", "alpha"])
+        with self.assertRaises(input_serializer.SerializationError) as error:
+            serializer.serialize({"zeta": "a", "alpha": "b"})
+        self.assertEqual(str(error.exception), "Field: zeta Error: Data is not a integer")
+
+    def test_dict_serializer_instance_fields(self):
+        class SerializerTest(input_serializer.Serializer):
+            a = input_serializer.IntegerSerializer()
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.b = input_serializer.StringSerializer()
+
+        serializer = SerializerTest()
+        self.assertEqual(serializer.serialize({"a": 1, "b": "x"}), {"b": "x", "a": 1})
+        with self.assertRaises(input_serializer.SerializationError):
+            serializer.serialize({"a": 1})
+
+        serializer = SerializerTest()
+        serializer.optional_fields = ["b"]
+        self.assertEqual(serializer.serialize({"a": 1}), {"a": 1})
+
+        class ParentSerializer(input_serializer.Serializer):
+            codegen = True
+            child = SerializerTest()
+
+        with self.assertRaises(input_serializer.SerializationError):
+            ParentSerializer().serialize({"child": {"a": 1, "b": 2}})
+
+    def test_dict_serializer_nested_error(self):
+        class ChildSerializer(input_serializer.Serializer):
+            test = input_serializer.IntegerSerializer()
+
+        class ParentSerializer(input_serializer.Serializer):
+            child = ChildSerializer()
+
+        serializer = ParentSerializer()
+        with self.assertRaises(input_serializer.SerializationError) as error:
+            serializer.serialize({"child": {"test": "a"}})
+        self.assertEqual(
+            str(error.exception),
+            "Field: child Error: Field: test Error: Data is not a integer",
+        )
@@ -0,0 +1,194 @@
+import unittest
+from enum import Enum
+
+import fastjsonschema
+
+from pyverless.serialization import input_serializer
+from pyverless.serialization.json_schema import to_api_gateway_model, to_json_schema
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class UpperStringSerializer(input_serializer.StringSerializer):
+    def transform_data(self, input_data):
+        return super().transform_data(input_data).upper()
+
+
+class LooseIntegerSerializer(input_serializer.IntegerSerializer):
+    def validate_data(self, input_data):
+        pass
+
+
+class ChildSerializer(input_serializer.Serializer):
+    optional_fields = ["when"]
+
+    number = input_serializer.IntegerSerializer(nullable=False)
+    when = input_serializer.DateSerializer()
+
+
+class ParentSerializer(input_serializer.Serializer):
+    optional_fields = ["extra", "loose"]
+
+    name = input_serializer.StringSerializer(nullable=False)
+    code = UpperStringSerializer()
+    price = input_serializer.FloatSerializer()
+    active = input_serializer.BooleanSerializer()
+    color = input_serializer.EnumSerializer(Color)
+    at = input_serializer.TimeSerializer()
+    uid = input_serializer.UuidSerializer()
+    child = ChildSerializer()
+    children = input_serializer.ListSerializer(
+        items_serializer=ChildSerializer(nullable=False)
+    )
+    extra = input_serializer.BaseSerializer(nullable=False)
+    loose = LooseIntegerSerializer()
+
+
+def valid_payload():
+    return {
+        "name": "name",
+        "code": "abc",
+        "price": 1.5,
+        "active": True,
+        "color": "red",
+        "at": "9:30",
+        "uid": "0f8d3c3e-2b5e-4a4f-9b1c-7a3e8e2b6c1d",
+        "child": {"number": 1, "when": "2020-1-31"},
+        "children": [{"number": 2}, {"number": 3, "when": None}],
+        "extra": {"anything": ["goes"]},
+        "loose": "not an integer",
+    }
+
+
+def payloads():
+    yield valid_payload()
+    for field, value in [
+        ("name", None),
+        ("name", 1),
+        ("code", None),
+        ("price", 1),
+        ("price", "1"),
+        ("active", 1),
+        ("active", None),
+        ("color", "green"),
+        ("color", None),
+        ("at", "10"),
+        ("at", "24:00"),
+        ("at", "23:59"),
+        ("uid", "not-an-uuid"),
+        ("uid", "{0f8d3c3e2b5e4a4f9b1c7a3e8e2b6c1d}"),
+        ("uid", "0f8d3c3e-2b5e-4a4f-9b1c-7a3e8e2b6c1g"),
+        ("child", []),
+        ("child", None),
+        ("child", {"number": None}),
+        ("child", {"number": 1, "when": "31-01-2020"}),
+        ("child", {"number": 1, "when": "2020-13-01"}),
+        ("child", {}),
+        ("children", {}),
+        ("children", []),
+        ("children", [None]),
+        ("children", [{"number": "1"}]),
+        ("extra", None),
+        ("loose", None),
+    ]:
+        payload = valid_payload()
+        payload[field] = value
+        yield payload
+    for field in ["name", "extra", "loose"]:
+        payload = valid_payload()
+        del payload[field]
+        yield payload
+    yield []
+    yield None
+
+
+def unusual_payloads():
+    """
+    Payloads accepted by the schema, with whether the serializer accepts them:
+    exported schemas check the characters of uuids but not their exact syntax.
+    """
+    for field, value, valid in [
+        ("uid", "0f8d3c3e_2b5e4a4f9b1c7a3e8e2b6c1", True),
+        ("uid", " 0f8d3c3e2b5e4a4f9b1c7a3e8e2b6c1", True),
+        ("uid", "0f8d3c3e2b5e4a4f9b1c7a3e8e2b6c1 ", True),
+        ("uid", "}0f8d3c3e-2b5e-4a4f-9b1c-7a3e8e2b6c1d{", True),
+        ("uid", "urn:uuid:0f8d3c3e-2b5e-4a4f-9b1c-7a3e8e2b6c1d", True),
+        ("uid", "0x8d3c3e2b5e4a4f9b1c7a3e8e2b6c1d", True),
+        ("uid", "\u0663" * 32, True),
+        ("uid", "0f8d3c3e-2b5e-4a4f-9b1c-7a3e8e2b6c1", False),
+        ("at", "\u0669:3\u0660", True),
+        ("child", {"number": 1, "when": "\u0662\u0660\u0662\u0660-1-1"}, True),
+        ("child", {"number": 1, "when": "2020-1- 1"}, True),
+    ]:
+        payload = valid_payload()
+        payload[field] = value
+        yield payload, valid
+
+
+def accepts(function, payload):
+    try:
+        function(payload)
+    except (input_serializer.SerializationError, fastjsonschema.JsonSchemaException):
+        return False
+    return True
+
+
+class TestJsonSchema(unittest.TestCase):
+    def test_round_trip(self):
+        serializer = ParentSerializer()
+        validate = fastjsonschema.compile(to_json_schema(ParentSerializer))
+
+        for payload in payloads():
+            self.assertEqual(
+                accepts(validate, payload),
+                accepts(serializer.serialize, payload),
+                payload,
+            )
+
+    def test_unusual_payloads(self):
+        serializer = ParentSerializer()
+        validate = fastjsonschema.compile(to_json_schema(ParentSerializer))
+
+        for payload, valid in unusual_payloads():
+            self.assertTrue(accepts(validate, payload), payload)
+            self.assertEqual(accepts(serializer.serialize, payload), valid, payload)
+
+    def test_schema(self):
+        schema = to_json_schema(ChildSerializer(nullable=False))
+        self.assertEqual(
+            schema,
+            {
+                "$schema": "http://json-schema.org/draft-04/schema#",
+                "type": "object",
+                "properties": {
+                    "number": {"type": "integer"},
+                    "when": {
+                        "type": ["string", "null"],
+                        "pattern": schema["properties"]["when"]["pattern"],
+                    },
+                },
+                "required": ["number"],
+            },
+        )
+
+    def test_enum_schema(self):
+        schema = to_json_schema(input_serializer.EnumSerializer(Color))
+        self.assertEqual(schema["enum"], ["red", "blue", None])
+
+    def test_api_gateway_model(self):
+        model = to_api_gateway_model(ChildSerializer)
+        self.assertEqual(model["title"], "ChildSerializer")
+        self.assertEqual(model["$schema"], "http://json-schema.org/draft-04/schema#")
+        self.assertEqual(to_api_gateway_model(ChildSerializer, "Child")["title"], "Child")
+
+    def test_recursive_serializer(self):
+        class NodeSerializer(input_serializer.Serializer):
+            pass
+
+        NodeSerializer.child = NodeSerializer()
+
+        with self.assertRaises(ValueError):
+            to_json_schema(NodeSerializer)
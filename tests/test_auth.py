@@ -1,5 +1,7 @@
+import asyncio
 from unittest.mock import patch
-from pyverless.auth import authenticate
+from pyverless.auth import aauthenticate, authenticate, authenticate_async
+from pyverless.crypto import PBKDF2PasswordHasher, PBKDF2SHA1PasswordHasher
 
 from config_test.models import User
 
@@ -27,3 +29,39 @@ class TestAuth():
 
         # Test unsuccesful authentication. No user exists with the given password
         assert not authenticate('not_a_user@users.com', 'test-password')
+
+    @patch('pyverless.auth.get_user_by_email')
+    def test_authenticate_rehash(self, mock_user):
+        user = User(email='user@users.com', password='test-password')
+        mock_user.return_value = user
+
+        # Hashes with the current algorithm and cost are kept
+        encoded = user.password
+        with patch.object(User, 'save') as save:
+            assert authenticate('user@users.com', 'test-password')
+        assert user.password == encoded
+        assert not save.called
+
+        # Outdated hashes are replaced on login
+        for encoded in (
+            PBKDF2PasswordHasher().encode('test-password', iterations=1000),
+            PBKDF2SHA1PasswordHasher().encode('test-password'),
+        ):
+            user.password = encoded
+            with patch.object(User, 'save') as save:
+                assert authenticate('user@users.com', 'test-password')
+            assert user.password.startswith('pbkdf2_sha256$100000$')
+            assert save.called
+
+        # but not on failed logins
+        user.password = encoded
+        assert not authenticate('user@users.com', 'not-my-test-password')
+        assert user.password == encoded
+
+    @patch('pyverless.auth.get_user_by_email')
+    def test_authenticate_async(self, mock_user):
+        mock_user.return_value = self.user
+
+        assert authenticate_async('user@users.com', 'test-password').result() is self.user
+        assert asyncio.run(aauthenticate('user@users.com', 'test-password')) is self.user
+        assert asyncio.run(aauthenticate('user@users.com', 'not-my-test-password')) is None
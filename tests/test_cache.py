@@ -0,0 +1,46 @@
+from pyverless.utils.cache import MISSING, TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache():
+
+    def test_expiry(self):
+        timer = FakeTimer()
+        cache = TTLCache(max_size=10, ttl=10, timer=timer)
+
+        cache.set('key', 'value')
+        cache.set('short', 'value', ttl=1)
+        cache.set('none', None)
+
+        assert cache.get('key') == 'value'
+        assert cache.get('none') is None
+
+        timer.now = 5
+        assert cache.get('short') is MISSING
+        assert cache.get('key') == 'value'
+
+        timer.now = 10
+        assert cache.get('key') is MISSING
+        assert cache.stats() == {'hits': 3, 'misses': 2, 'size': 1}
+
+    def test_lru_eviction(self):
+        cache = TTLCache(max_size=2)
+
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('b') is MISSING
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+
+        cache.delete('a')
+        assert cache.get('a', None) is None
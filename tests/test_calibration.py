@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+from pyverless.crypto import PBKDF2PasswordHasher, ScryptPasswordHasher
+from pyverless.utils import calibration
+from pyverless.utils.calibration import calibrate, calibrate_pbkdf2, calibrate_scrypt
+
+
+class FakePBKDF2Hasher(PBKDF2PasswordHasher):
+    # 1 microsecond per iteration
+    def encode(self, password, salt=None, iterations=None):
+        self.seconds = iterations * 1e-6
+
+
+class FakeScryptHasher(ScryptPasswordHasher):
+    # 10 microseconds per unit of work factor
+    def encode(self, password, salt=None, n=None, r=None, p=None):
+        self.seconds = n * 1e-5
+
+
+class FailingScryptHasher(FakeScryptHasher):
+    def encode(self, password, salt=None, n=None, r=None, p=None):
+        if n > 2 ** 11:
+            raise ValueError('memory limit exceeded')
+        super().encode(password, salt, n, r, p)
+
+
+def fake_measure(hasher):
+    def measure(function, repeat=3):
+        function()
+        return hasher.seconds
+    return measure
+
+
+class TestCalibration():
+
+    def test_calibrate_pbkdf2(self):
+        hasher = FakePBKDF2Hasher()
+        with patch.object(calibration, 'measure', fake_measure(hasher)):
+            result = calibrate_pbkdf2(0.1, hasher)
+
+        assert result.algorithm == 'pbkdf2_sha256'
+        assert result.params == {'iterations': 100000}
+        assert result.seconds <= 0.1
+
+    def test_calibrate_scrypt(self):
+        hasher = FakeScryptHasher()
+        with patch.object(calibration, 'measure', fake_measure(hasher)):
+            result = calibrate_scrypt(0.1, hasher)
+
+        assert result.algorithm == 'scrypt'
+        assert result.params == {'n': 2 ** 13, 'r': 8, 'p': 1}
+        assert result.seconds <= 0.1
+
+    def test_calibrate_scrypt_memory(self):
+        hasher = FakeScryptHasher()
+        with patch.object(calibration, 'measure', fake_measure(hasher)):
+            # 128 * n * r * p bytes
+            result = calibrate_scrypt(10, hasher, max_memory=128 * 2 ** 12 * 8)
+        assert result.params['n'] == 2 ** 12
+        assert 'max memory' in result.note
+
+        hasher = FailingScryptHasher()
+        with patch.object(calibration, 'measure', fake_measure(hasher)):
+            result = calibrate_scrypt(10, hasher, max_memory=2 ** 30)
+        assert result.params['n'] == 2 ** 11
+        assert 'memory limit exceeded' in result.note
+
+    def test_max_memory(self):
+        with patch.dict('os.environ', {'AWS_LAMBDA_FUNCTION_MEMORY_SIZE': '512'}):
+            assert calibration.get_max_memory() == 128 * 2 ** 20
+        with patch.dict('os.environ', clear=True):
+            assert calibration.get_max_memory() == calibration.DEFAULT_MAX_MEMORY
+
+    def test_calibrate(self):
+        results = calibrate(0.005, [PBKDF2PasswordHasher()], repeat=1)
+
+        assert [result.algorithm for result in results] == ['pbkdf2_sha256']
+        assert results[0].params['iterations'] >= 1000
@@ -1,5 +1,10 @@
 import os
-from pyverless.config import Settings, settings
+from unittest.mock import patch
+
+import pytest
+
+from pyverless.config import Settings, settings, snapshot
+from pyverless.config.snapshot import build_snapshot, load_snapshot
 
 here = os.path.dirname(os.path.realpath(__file__))
 
@@ -51,3 +56,115 @@ class TestConfig():
 
         # The following setting is found in pyverless.config.base_settings
         assert settings.JWT_ALGORITHM == 'HS256'
+
+    def test_settings_snapshot(self, tmp_path):
+        path_to_yml = str(tmp_path / 'settings.yml')
+        with open(os.path.join(here, 'config_test/settings.yml')) as yml:
+            content = yml.read()
+        with open(path_to_yml, 'w') as yml:
+            yml.write(content)
+
+        assert build_snapshot(path_to_yml) == path_to_yml + '.snapshot'
+
+        # A fresh snapshot is loaded instead of the yaml file
+        with patch.object(Settings, 'load_from_yaml_file') as load_from_yaml_file:
+            settings = Settings(path_to_yml)
+        assert not load_from_yaml_file.called
+        assert settings.SECRET_KEY == 'test-secret-key-from-yml'
+        assert settings.JWT_ALGORITHM == 'HS256'
+
+        # Changing the source makes it stale
+        with open(path_to_yml, 'w') as yml:
+            yml.write(content.replace('test-secret-key-from-yml', 'changed-secret-key'))
+        assert load_snapshot(path_to_yml) is None
+        assert Settings(path_to_yml).SECRET_KEY == 'changed-secret-key'
+
+    def test_settings_snapshot_of_module(self, tmp_path):
+        path = str(tmp_path / 'settings.snapshot')
+        snapshot.main(['config_test.settings', '--output', path])
+
+        with patch.dict(os.environ, {'PYVERLESS_SETTINGS_SNAPSHOT': path}):
+            assert load_snapshot('config_test.settings')['SECRET_KEY'] == 'test-secret-key'
+            # Snapshots only apply to the source they were built from
+            assert load_snapshot(os.path.join(here, 'config_test/settings.yml')) is None
+
+    def test_settings_snapshot_of_module_imports(self, tmp_path, monkeypatch):
+        package = tmp_path / 'snapshot_settings'
+        package.mkdir()
+        (package / '__init__.py').write_text('')
+        (package / 'common.py').write_text("SECRET_KEY = 'common-secret-key'\n")
+        (package / 'base.py').write_text('from .common import *\n')
+        (package / 'settings.py').write_text('import os\nfrom .base import *\n')
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        path = build_snapshot('snapshot_settings.settings')
+        assert load_snapshot('snapshot_settings.settings')['SECRET_KEY'] == 'common-secret-key'
+
+        # Modules imported by the settings module make it stale too
+        (package / 'common.py').write_text("SECRET_KEY = 'changed-secret-key'\n")
+        assert load_snapshot('snapshot_settings.settings') is None
+        assert path == str(package / 'settings.py.snapshot')
+
+    def test_unreadable_snapshot(self, tmp_path):
+        path_to_yml = str(tmp_path / 'settings.yml')
+        with open(path_to_yml, 'w') as yml:
+            yml.write('SECRET_KEY: yml-secret-key\n')
+        snapshot_path = build_snapshot(path_to_yml)
+
+        # Truncated
+        with open(snapshot_path, 'rb') as snapshot_file:
+            content = snapshot_file.read()
+        with open(snapshot_path, 'wb') as snapshot_file:
+            snapshot_file.write(content[:len(content) // 2])
+        assert load_snapshot(path_to_yml) is None
+        assert Settings(path_to_yml).SECRET_KEY == 'yml-secret-key'
+
+        # Not a snapshot
+        with open(snapshot_path, 'wb') as snapshot_file:
+            snapshot_file.write(b'not a pickle')
+        assert load_snapshot(path_to_yml) is None
+
+    def test_typed_settings_from_environ(self):
+        environ = {
+            'JWT_EXPIRY': '600',
+            'DEBUG': 'False',
+            'USE_SENTRY': 'yes',
+            'SENTRY_SAMPLE_RATE': '0.5',
+            'PASSWORD_HASHERS': 'pyverless.crypto.ScryptPasswordHasher, pyverless.crypto.PBKDF2PasswordHasher',
+            'STAGE': 'dev',
+        }
+        with patch.dict(os.environ, environ):
+            os.environ.pop('PYVERLESS_SETTINGS', None)
+            settings = Settings()
+
+            # Environment variables are only read when accessed
+            assert 'JWT_EXPIRY' not in vars(settings)
+            assert settings.JWT_EXPIRY == 600
+            assert settings.DEBUG is False
+            assert settings.USE_SENTRY is True
+            assert settings.SENTRY_SAMPLE_RATE == 0.5
+            assert settings.PASSWORD_HASHERS == [
+                'pyverless.crypto.ScryptPasswordHasher', 'pyverless.crypto.PBKDF2PasswordHasher'
+            ]
+            # Settings without a type are kept as strings
+            assert settings.STAGE == 'dev'
+            # and those without a variable take the base settings value
+            assert settings.JWT_LEEWAY == 60
+
+            # Values are resolved once
+            os.environ['JWT_EXPIRY'] = '900'
+            assert settings.JWT_EXPIRY == 600
+
+            os.environ['JWT_LEEWAY'] = 'sixty'
+            with pytest.raises(ValueError):
+                Settings().JWT_LEEWAY
+            with pytest.raises(AttributeError):
+                Settings().NOT_A_SETTING
+
+    def test_frozen_settings(self):
+        frozen = Settings('config_test.settings').freeze()
+
+        assert frozen.SECRET_KEY == 'test-secret-key'
+        assert frozen.JWT_EXPIRY == 300
+        with pytest.raises(AttributeError):
+            frozen.SECRET_KEY = 'another-secret-key'
@@ -1,9 +1,22 @@
+import asyncio
+import base64
+import json
+import random
+from collections import Counter
 from datetime import datetime
 from calendar import timegm
 import time
+import jwt
 import pytest
+from unittest.mock import patch
 
-from pyverless.crypto import PBKDF2PasswordHasher, get_json_web_token, decode_json_web_token, is_expired
+from pyverless import crypto
+from pyverless.config import settings
+from pyverless.utils.cache import TTLCache
+from pyverless.crypto import (
+    PBKDF2PasswordHasher, PBKDF2SHA1PasswordHasher, ScryptPasswordHasher, acheck_password, check_password,
+    get_json_web_token, get_random_string, get_random_strings, get_cached_json_web_token, decode_json_web_token, is_expired
+)
 from pyverless.exceptions import Unauthorized
 
 
@@ -22,6 +35,61 @@ class TestCrypto():
 
         assert self.hasher.verify(self.password, encoded_password)
 
+    def test_check_password(self):
+        encoded_password = self.hasher.encode(self.password)
+        assert check_password(self.password, encoded_password)
+        assert not check_password('wrong-password', encoded_password)
+        assert not check_password(self.password, None)
+        assert not check_password(self.password, 'md5$salt$hash')
+
+        # Passwords hashed by another configured hasher are verified
+        sha1_password = PBKDF2SHA1PasswordHasher().encode(self.password)
+        assert check_password(self.password, sha1_password)
+        assert asyncio.run(acheck_password(self.password, sha1_password))
+
+        assert not self.hasher.must_update(encoded_password)
+        assert self.hasher.must_update(self.hasher.encode(self.password, iterations=1000))
+
+    def test_random_strings(self):
+        state = random.getstate()
+
+        assert len(get_random_string()) == 12
+        assert get_random_string(0) == ''
+        assert set(get_random_string(100, 'ab')) <= {'a', 'b'}
+        assert set(get_random_string(100, 'áé')) <= {'á', 'é'}
+        # Sequences other than strings are accepted as well
+        assert set(get_random_string(100, list('abc'))) <= {'a', 'b', 'c'}
+        assert set(get_random_string(100, ('a', 'b'))) <= {'a', 'b'}
+
+        strings = get_random_strings(1000, length=16)
+        assert len(strings) == 1000
+        assert all(len(string) == 16 for string in strings)
+        assert len(set(strings)) == 1000
+        assert get_random_strings(0) == []
+
+        # Every character is as likely, although 62 does not divide 256
+        with patch('pyverless.crypto.os.urandom', lambda size: bytes(range(256)) * (size // 256 + 1)):
+            counts = Counter(get_random_string(62 * 4 * 10))
+        assert set(counts) == set(crypto.RANDOM_STRING_CHARS)
+        assert set(counts.values()) == {40}
+
+        # The random module is left alone
+        assert random.getstate() == state
+
+    def test_scrypt(self):
+        hasher = ScryptPasswordHasher()
+        encoded_password = hasher.encode(self.password, n=2 ** 10)
+
+        # The cost parameters are stored with the password
+        assert encoded_password.startswith('scrypt$1024$')
+        assert hasher.decode(encoded_password)['block_size'] == 8
+        assert hasher.verify(self.password, encoded_password)
+        assert not hasher.verify('wrong-password', encoded_password)
+        assert check_password(self.password, encoded_password)
+
+        assert hasher.must_update(encoded_password)
+        assert not hasher.must_update(hasher.encode(self.password))
+
     def test_json_web_tokens(self):
 
         # Create a new json web token
@@ -41,8 +109,74 @@ class TestCrypto():
         with pytest.raises(Unauthorized):
             decode_json_web_token('this-is-a-fake-token')
 
+        # Nor a token with a malformed header
+        token = jwt.encode(self.token_payload, settings.SECRET_KEY, 'HS256').decode('utf-8')
+        header = base64.urlsafe_b64encode(json.dumps({'alg': 'HS256', 'kid': ['a']}).encode())
+        token = header.decode('utf-8').rstrip('=') + token[token.index('.'):]
+        with pytest.raises(Unauthorized):
+            decode_json_web_token(token)
+
     def test_is_expired(self):
         now = timegm(datetime.utcnow().utctimetuple())
         expiry = now + 100  # Expiry is 100 seconds away from now
 
         assert not is_expired(expiry)
+
+    def test_decoded_tokens_cache(self):
+        cache = TTLCache(max_size=10)
+
+        with patch('pyverless.crypto.decoded_tokens_cache', cache):
+            token = get_json_web_token(dict(self.token_payload))
+
+            decoded = decode_json_web_token(token)
+            assert cache.stats() == {'hits': 0, 'misses': 1, 'size': 1}
+
+            # Cached claims are copies
+            decoded['email'] = 'changed@users.com'
+            assert decode_json_web_token(token)['email'] == 'user@users.com'
+            assert cache.hits == 1
+
+            # A different secret key misses the cache and fails verification
+            with patch('pyverless.crypto.settings.SECRET_KEY', 'another-secret-key'):
+                with pytest.raises(Unauthorized):
+                    decode_json_web_token(token)
+
+            # Expired tokens are not returned from the cache
+            token = get_json_web_token(dict(self.token_payload), expiry=1)
+            decode_json_web_token(token, leeway=0)
+            time.sleep(2)
+            with pytest.raises(Unauthorized):
+                decode_json_web_token(token, leeway=0)
+            # but still are within the leeway
+            assert decode_json_web_token(token, leeway=60)['uid'] == self.token_payload['uid']
+
+    def test_minted_tokens_cache(self):
+        with patch('pyverless.crypto.minted_tokens_cache', TTLCache(max_size=10)):
+            payload = dict(self.token_payload)
+            token = get_cached_json_web_token(payload)
+
+            # The payload is not modified and equal payloads share the token
+            assert payload == self.token_payload
+            assert get_cached_json_web_token(dict(reversed(list(payload.items())))) == token
+            assert get_cached_json_web_token(dict(payload, uid='other')) != token
+            assert decode_json_web_token(token)['uid'] == self.token_payload['uid']
+
+            # Tokens past half their lifetime are still returned while a new one
+            # is minted in the background
+            token = get_cached_json_web_token(payload, expiry=4)
+            time.sleep(2)
+            assert get_cached_json_web_token(payload, expiry=4) == token
+            while crypto._refreshing_tokens:
+                time.sleep(0.01)
+            refreshed = get_cached_json_web_token(payload, expiry=4)
+            assert refreshed != token
+            assert decode_json_web_token(refreshed, leeway=0)['exp'] > decode_json_web_token(token, leeway=0)['exp']
+
+    def test_minted_tokens_cache_after_rotations(self):
+        with patch('pyverless.crypto.minted_tokens_cache', TTLCache(max_size=10)):
+            for _ in range(20):
+                for secret in ['first-secret', 'second-secret', 'third-secret']:
+                    with patch('pyverless.keys.settings.SECRET_KEY', secret):
+                        token = get_cached_json_web_token(dict(self.token_payload))
+                        # Tokens minted with a previous key are not handed out
+                        assert jwt.decode(token, secret, algorithms=['HS256'])['uid'] == self.token_payload['uid']
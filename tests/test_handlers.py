@@ -1,4 +1,8 @@
 import json
+import time
+
+import pytest
+
 from pyverless import handlers
 
 from config_test.models import User, UserSerializer
@@ -314,3 +318,116 @@ class TestHandlers():
 
         assert status_code == 204
         assert not response_body
+
+    def test_pipeline(self):
+        pipeline = self.TestUpdateHandler.get_pipeline()
+
+        assert [(step.attr, step.method) for step in pipeline] == [
+            ('body', 'get_body'),
+            ('queryset', 'get_queryset'),
+            ('object', 'get_object'),
+            ('response_body', 'perform_action'),
+        ]
+        assert [step.provider for step in pipeline] == [
+            handlers.RequestBodyMixin,
+            handlers.ObjectMixin,
+            handlers.ObjectMixin,
+            handlers.UpdateHandler,
+        ]
+        assert pipeline[2].function is handlers.ObjectMixin.__dict__['get_object']
+        # The pipeline is computed once per handler class
+        assert self.TestUpdateHandler.get_pipeline() is pipeline
+        assert self.TestDeleteHandler.get_pipeline()[-1].provider == handlers.DeleteHandler
+
+
+    def test_replaced_pipeline_method(self):
+        class TestHandler(handlers.BaseHandler):
+            def perform_action(self):
+                return {'version': 1}
+
+        class TestChildHandler(TestHandler):
+            pass
+
+        handler = TestChildHandler.as_handler()
+        assert _(handler({}, {}))[0] == {'version': 1}
+
+        # Replacing a method on a parent class refreshes the cached pipelines
+        TestHandler.perform_action = lambda self: {'version': 2}
+        assert _(handler({}, {}))[0] == {'version': 2}
+
+
+class TestConcurrentPipeline():
+
+    class TestConcurrentHandler(handlers.BaseHandler):
+        pipeline_dependencies = {"user": (), "queryset": (), "object": ("queryset",)}
+
+        def get_user(self):
+            time.sleep(self.event.get("user_delay", 0.2))
+            if self.event.get("fail") == "user":
+                self.error = ("Unauthorized", 403)
+                raise handlers.Unauthorized()
+            if self.event.get("fail") == "user_crash":
+                raise KeyError("user")
+            return "user"
+
+        def get_queryset(self):
+            return ["object"]
+
+        def get_object(self):
+            time.sleep(0.2)
+            if self.event.get("fail") == "object":
+                raise KeyError("object")
+            if self.event.get("missing"):
+                self.error = ("Resource Not Found", 404)
+                raise handlers.NotFound()
+            return self.queryset[0]
+
+        def perform_action(self):
+            return {"user": self.user, "object": self.object}
+
+    def test_pipeline_graph(self):
+        graph = self.TestConcurrentHandler.get_pipeline_graph()
+
+        # user, queryset, object, response_body
+        assert graph == (frozenset(), frozenset(), frozenset({1}), frozenset({0, 1, 2}))
+        assert handlers.RetrieveHandler.get_pipeline_graph() is None
+
+    def test_concurrent_steps(self):
+        handler = self.TestConcurrentHandler.as_handler()
+
+        start = time.monotonic()
+        response_body, status_code = _(handler({}, {}))
+
+        assert time.monotonic() - start < 0.35
+        assert status_code == 200
+        assert response_body == {"user": "user", "object": "object"}
+
+    def test_concurrent_errors(self):
+        handler = self.TestConcurrentHandler.as_handler()
+
+        response_body, status_code = _(handler({"fail": "user"}, {}))
+        assert status_code == 403
+        assert response_body["message"] == "Unauthorized"
+
+        response_body, status_code = _(handler({"fail": "object"}, {}))
+        assert status_code == 500
+
+    def test_concurrent_errors_order(self):
+        handler = self.TestConcurrentHandler.as_handler()
+
+        # get_object fails first, the error of the earlier get_user step wins
+        event = {"fail": "user", "missing": True, "user_delay": 0.4}
+        response_body, status_code = _(handler(event, {}))
+        assert status_code == 403
+        assert response_body["message"] == "Unauthorized"
+
+        event = {"fail": "user_crash", "missing": True, "user_delay": 0.4}
+        response_body, status_code = _(handler(event, {}))
+        assert status_code == 500
+
+    def test_circular_dependencies(self):
+        class TestCircularHandler(self.TestConcurrentHandler):
+            pipeline_dependencies = {"user": ("object",), "object": ("user",)}
+
+        with pytest.raises(ValueError):
+            TestCircularHandler.as_handler()
@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# Third party packages imported on first use only
+LAZY_PACKAGES = ["aws_lambda_powertools", "cryptography", "jwt", "sentry_sdk", "yaml"]
+
+
+def get_loaded_packages(statement):
+    """
+    Run statement in a fresh interpreter, returns the LAZY_PACKAGES loaded.
+    """
+    code = (
+        f"{statement}\n"
+        "import json, sys\n"
+        f"print(json.dumps([p for p in {LAZY_PACKAGES!r} if p in sys.modules]))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "tests")]))
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+class TestLazyImports():
+
+    @pytest.mark.parametrize("module", [
+        "pyverless.handlers",
+        "pyverless.auth",
+        "pyverless.api_gateway_handler.api_gateway_handler_standalone",
+    ])
+    def test_import(self, module):
+        assert get_loaded_packages(f"import {module}") == []
+
+    def test_import_on_use(self):
+        assert get_loaded_packages(
+            "from pyverless.api_gateway_handler.api_gateway_handler import APIGatewayWebsocketEvent"
+        ) == ["aws_lambda_powertools"]
+        # PyJWT imports cryptography when it is installed
+        assert set(get_loaded_packages(
+            "from pyverless.crypto import get_json_web_token; get_json_web_token({})"
+        )) - {"cryptography"} == {"jwt"}
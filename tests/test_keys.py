@@ -0,0 +1,232 @@
+import base64
+import json
+from unittest.mock import patch
+
+import jwt
+import pytest
+
+from pyverless import keys
+from pyverless.crypto import decode_json_web_token, get_json_web_token
+from pyverless.exceptions import Unauthorized
+from pyverless.keys import KeyManager, get_key_manager, set_key_manager
+from pyverless.utils.cache import TTLCache
+
+try:
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+except ImportError:
+    rsa = None
+
+requires_cryptography = pytest.mark.skipif(
+    rsa is None, reason="cryptography is not installed"
+)
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def int_to_base64url(value, length):
+    return base64.urlsafe_b64encode(value.to_bytes(length, "big")).decode().rstrip("=")
+
+
+def ec_jwk(private_key, kid):
+    numbers = private_key.public_key().public_numbers()
+    return {
+        "kty": "EC",
+        "crv": "P-256",
+        "kid": kid,
+        "x": int_to_base64url(numbers.x, 32),
+        "y": int_to_base64url(numbers.y, 32),
+    }
+
+
+class TestKeyManager():
+
+    def test_shared_secret_rotation(self):
+        manager = KeyManager()
+        manager.add_key("old-secret", "HS256", kid="old")
+        manager.add_key("new-secret", "HS256", kid="new", signing=True)
+
+        token = manager.encode({"uid": 1})
+        assert jwt.get_unverified_header(token)["kid"] == "new"
+        assert manager.decode(token) == {"uid": 1}
+
+        # Tokens signed with the previous key are still accepted
+        old_token = jwt.encode({"uid": 2}, "old-secret", "HS256", headers={"kid": "old"})
+        assert manager.decode(old_token) == {"uid": 2}
+
+        unknown = jwt.encode({"uid": 3}, "old-secret", "HS256", headers={"kid": "other"})
+        with pytest.raises(Unauthorized):
+            manager.decode(unknown)
+
+    def test_signing_key_without_kid(self):
+        manager = KeyManager()
+        manager.add_key("secret", "HS256", signing=True)
+
+        # Tokens of other services, with a kid, are verified with the signing key
+        token = jwt.encode({"uid": 1}, "secret", "HS256", headers={"kid": "other"})
+        assert manager.decode(token) == {"uid": 1}
+
+        token = jwt.encode({"uid": 1}, "another-secret", "HS256", headers={"kid": "other"})
+        with pytest.raises(jwt.exceptions.InvalidSignatureError):
+            manager.decode(token)
+
+    def test_generation(self):
+        manager = KeyManager()
+        generation = manager.generation
+        manager.add_key("secret", "HS256", signing=True)
+        assert manager.generation > generation
+
+    @requires_cryptography
+    def test_rsa(self):
+        private_key = rsa.generate_private_key(65537, 2048, default_backend())
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        manager = KeyManager()
+        manager.add_key(pem, "RS256", kid="rsa", signing=True)
+
+        token = manager.encode({"uid": 1})
+        assert manager.decode(token) == {"uid": 1}
+
+        # Only the public key is needed to verify
+        verifier = KeyManager()
+        verifier.load_jwks({"keys": [
+            dict(json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key())), kid="rsa")
+        ]})
+        assert verifier.decode(token) == {"uid": 1}
+        with pytest.raises(ValueError):
+            verifier.encode({"uid": 1})
+
+    @requires_cryptography
+    def test_ec_jwks(self):
+        private_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+        signer = KeyManager()
+        signer.add_key(private_key, "ES256", kid="ec", signing=True)
+        token = signer.encode({"uid": 1})
+
+        verifier = KeyManager()
+        verifier.load_jwks({"keys": [ec_jwk(private_key, "ec")]})
+        assert verifier.decode(token) == {"uid": 1}
+
+    @requires_cryptography
+    def test_jwks_fetcher(self):
+        first = ec.generate_private_key(ec.SECP256R1(), default_backend())
+        second = ec.generate_private_key(ec.SECP256R1(), default_backend())
+        jwks = {"keys": [ec_jwk(first, "first")]}
+        fetches = []
+
+        def fetcher():
+            fetches.append(1)
+            return jwks
+
+        timer = FakeTimer()
+        manager = KeyManager(
+            jwks_fetcher=fetcher, jwks_ttl=300, jwks_min_refresh_interval=30, timer=timer
+        )
+        first_token = jwt.encode({"uid": 1}, first, "ES256", headers={"kid": "first"})
+        second_token = jwt.encode({"uid": 2}, second, "ES256", headers={"kid": "second"})
+
+        assert manager.decode(first_token) == {"uid": 1}
+        assert manager.decode(first_token) == {"uid": 1}
+        assert len(fetches) == 1
+
+        # Unknown kids refresh the keys, at most once per interval
+        jwks = {"keys": [ec_jwk(first, "first"), ec_jwk(second, "second")]}
+        timer.now = 10
+        with pytest.raises(Unauthorized):
+            manager.decode(second_token)
+        assert len(fetches) == 1
+        timer.now = 40
+        assert manager.decode(second_token) == {"uid": 2}
+        assert len(fetches) == 2
+
+        # Keys removed from the document are dropped after the time to live
+        jwks = {"keys": [ec_jwk(second, "second")]}
+        timer.now = 400
+        with pytest.raises(Unauthorized):
+            manager.decode(first_token)
+        assert len(fetches) == 3
+
+    def test_load_jwks_file(self, tmp_path):
+        secret = base64.urlsafe_b64encode(b"file-secret").decode().rstrip("=")
+        path = tmp_path / "jwks.json"
+        path.write_text(json.dumps({"keys": [{"kty": "oct", "kid": "file", "k": secret}]}))
+
+        manager = KeyManager()
+        manager.load_jwks_file(str(path))
+        token = jwt.encode({"uid": 1}, "file-secret", "HS256", headers={"kid": "file"})
+        assert manager.decode(token) == {"uid": 1}
+
+
+class TestGetKeyManager():
+
+    def test_built_once_from_settings(self):
+        manager = get_key_manager()
+        assert get_key_manager() is manager
+
+        with patch("pyverless.keys.settings.SECRET_KEY", "another-secret-key"):
+            assert get_key_manager() is not manager
+        assert get_key_manager() is not manager
+
+    def test_unique_manager_uid(self):
+        uids = set()
+        for _ in range(10):
+            # Freed managers may share their id(), never their uid
+            uids.add(KeyManager().uid)
+        assert len(uids) == 10
+
+    def test_decode_cache_after_rotations(self):
+        with patch("pyverless.crypto.decoded_tokens_cache", TTLCache(max_size=10)):
+            for _ in range(20):
+                with patch("pyverless.keys.settings.SECRET_KEY", "first-secret"):
+                    token = get_json_web_token({"uid": 1})
+                    assert decode_json_web_token(token)["uid"] == 1
+                for secret in ["second-secret", "third-secret"]:
+                    with patch("pyverless.keys.settings.SECRET_KEY", secret):
+                        with pytest.raises(Unauthorized):
+                            decode_json_web_token(token)
+
+    def test_decode_cache_jwks_refresh(self):
+        secret = base64.urlsafe_b64encode(b"jwks-secret").decode().rstrip("=")
+        jwks = {"keys": [{"kty": "oct", "kid": "jwks", "k": secret}]}
+        timer = FakeTimer()
+        manager = KeyManager(jwks_fetcher=lambda: jwks, jwks_ttl=300, timer=timer)
+        token = jwt.encode({"uid": 1}, "jwks-secret", "HS256", headers={"kid": "jwks"})
+
+        set_key_manager(manager)
+        try:
+            cache = TTLCache(max_size=10)
+            with patch("pyverless.crypto.decoded_tokens_cache", cache):
+                assert decode_json_web_token(token)["uid"] == 1
+                assert decode_json_web_token(token)["uid"] == 1
+                assert cache.hits == 1
+
+                # Claims verified with a key removed from the document are not
+                # returned from the cache once it is fetched again
+                jwks = {"keys": []}
+                timer.now = 400
+                with pytest.raises(Unauthorized):
+                    decode_json_web_token(token)
+        finally:
+            set_key_manager(None)
+
+    def test_set_key_manager(self):
+        manager = KeyManager()
+        manager.add_key("custom-secret", "HS256", kid="custom", signing=True)
+        set_key_manager(manager)
+        try:
+            token = get_json_web_token({"uid": 1})
+            assert jwt.get_unverified_header(token)["kid"] == "custom"
+            assert decode_json_web_token(token)["uid"] == 1
+        finally:
+            set_key_manager(None)
+        assert keys.get_key_manager() is not manager
@@ -0,0 +1,45 @@
+import json
+import logging
+import unittest
+
+from pyverless.utils import logging as pyverless_logging
+from pyverless.utils.logging import (
+    CustomJsonFormatter,
+    configure_logging,
+    get_enabled_logging_functions,
+    set_aws_request_id,
+)
+
+
+class TestLogging(unittest.TestCase):
+    def format(self, message):
+        record = logging.LogRecord(
+            "pyverless", logging.INFO, __file__, 1, message, None, None
+        )
+        return json.loads(CustomJsonFormatter().format(record))
+
+    def test_configure_logging_once(self):
+        pyverless_logging._configuration = None
+
+        self.assertTrue(configure_logging(logger_level="INFO"))
+        self.assertFalse(configure_logging(logger_level="INFO"))
+        self.assertEqual(logging.getLogger("pyverless").level, logging.INFO)
+
+        self.assertTrue(configure_logging(logger_level="DEBUG"))
+        self.assertEqual(logging.getLogger("pyverless").level, logging.DEBUG)
+
+    def test_enabled_logging_functions(self):
+        logger = logging.getLogger("pyverless.test_enabled_logging_functions")
+        logger.setLevel(logging.WARNING)
+
+        self.assertEqual(
+            get_enabled_logging_functions([logger.info, logger.error, print]),
+            [logger.error, print],
+        )
+
+    def test_aws_request_id(self):
+        set_aws_request_id("first-request")
+        self.assertEqual(self.format("test")["aws_request_id"], "first-request")
+
+        set_aws_request_id("second-request")
+        self.assertEqual(self.format("test")["aws_request_id"], "second-request")
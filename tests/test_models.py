@@ -0,0 +1,101 @@
+import importlib
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from config_test.models import User
+from pyverless import models
+from pyverless.models import (
+    clear_user_cache, get_model_manager, get_user_by_uid, get_user_model, import_model, invalidate_user, lazy_model
+)
+from pyverless.utils.cache import TTLCache
+
+
+class TestModelRegistry():
+
+    @patch.dict('pyverless.models._models', clear=True)
+    def test_import_model(self):
+        with patch('pyverless.models.importlib.import_module', wraps=importlib.import_module) as import_module:
+            assert import_model('config_test.models.User') is User
+            assert import_model('config_test.models.User') is User
+            assert get_user_model() is User
+
+        import_module.assert_called_once_with('config_test.models')
+
+    def test_invalid_user_model(self):
+        with patch('pyverless.models.settings.USER_MODEL', None):
+            with pytest.raises(AttributeError):
+                get_user_model()
+
+    def test_get_model_manager(self):
+        assert get_model_manager(User) is User.objects
+        assert get_model_manager(lazy_model('config_test.models.User')) is User.objects
+
+    def test_stateful_model_manager(self):
+        # Managers built on each access (e.g. neomodel NodeSet) are not reused
+        class Model:
+            objects = property(lambda self: object())
+
+        model = Model()
+        assert get_model_manager(model) is not get_model_manager(model)
+
+    @patch.dict('pyverless.models._models', clear=True)
+    def test_lazy_model(self):
+        with patch('pyverless.models.importlib.import_module', wraps=importlib.import_module) as import_module:
+            model = lazy_model('config_test.models.User')
+            assert not import_module.called
+
+            assert model.objects is User.objects
+            assert model(email='user@users.com', password='password').email == 'user@users.com'
+            import_module.assert_called_once_with('config_test.models')
+
+
+class TestUserCache():
+
+    def setup_method(self):
+        self.manager = MagicMock()
+        self.manager.get_or_none.side_effect = lambda uid: None if uid == 'unknown' else {'uid': uid}
+        self.user_model = MagicMock(objects=self.manager)
+
+    def test_disabled_by_default(self):
+        with patch('pyverless.models.get_user_model', return_value=self.user_model):
+            get_user_by_uid('user')
+            get_user_by_uid('user')
+
+        assert self.manager.get_or_none.call_count == 2
+
+    def test_cache(self):
+        cache = TTLCache(max_size=10, ttl=60)
+        with patch('pyverless.models.user_cache', cache), \
+                patch('pyverless.models.get_user_model', return_value=self.user_model):
+            user = get_user_by_uid('user')
+            assert get_user_by_uid('user') is user
+            assert self.manager.get_or_none.call_count == 1
+
+            # Unknown users are cached too
+            assert get_user_by_uid('unknown') is None
+            assert get_user_by_uid('unknown') is None
+            assert self.manager.get_or_none.call_count == 2
+
+            invalidate_user('user')
+            assert get_user_by_uid('user') is not user
+            assert self.manager.get_or_none.call_count == 3
+
+            clear_user_cache()
+            assert len(models.user_cache) == 0
+
+    def test_negative_ttl(self):
+        now = [0]
+        cache = TTLCache(max_size=10, ttl=60, timer=lambda: now[0])
+        with patch('pyverless.models.user_cache', cache), \
+                patch('pyverless.models.settings.USER_CACHE_NEGATIVE_TTL', 5), \
+                patch('pyverless.models.get_user_model', return_value=self.user_model):
+            get_user_by_uid('user')
+            get_user_by_uid('unknown')
+
+            now[0] = 10
+            get_user_by_uid('user')
+            get_user_by_uid('unknown')
+            assert [call.kwargs['uid'] for call in self.manager.get_or_none.call_args_list] == [
+                'user', 'unknown', 'unknown'
+            ]
@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from pyverless import handlers
+from pyverless.utils.sentry import SentryReporter, get_flush_timeout
+
+
+def raise_error(message="error"):
+    try:
+        raise ValueError(message)
+    except ValueError as e:
+        return e
+
+
+class LambdaContext:
+    def __init__(self, remaining):
+        self.remaining = remaining
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining
+
+
+@patch("sentry_sdk.flush")
+@patch("sentry_sdk.capture_exception")
+@patch("sentry_sdk.init")
+class TestSentryReporter(unittest.TestCase):
+    def test_report_and_flush(self, init, capture_exception, flush):
+        reporter = SentryReporter(dsn="https://key@sentry.example/1")
+        error = raise_error()
+
+        self.assertTrue(reporter.report(error, tags={"stage": "test"}))
+        self.assertTrue(reporter.report(raise_error("another")))
+        self.assertTrue(reporter.flush(timeout=2))
+
+        init.assert_called_once_with(dsn="https://key@sentry.example/1")
+        self.assertEqual(capture_exception.call_count, 2)
+        capture_exception.assert_any_call(error)
+        flush.assert_called_once()
+
+    def test_report_scope(self, init, capture_exception, flush):
+        reporter = SentryReporter(dsn="dsn")
+        error = raise_error()
+
+        with patch("pyverless.utils.sentry.new_scope") as new_scope:
+            reporter.report(
+                error, user={"id": "uid"}, tags={"stage": "test"}, extras={"body": {}}
+            )
+            reporter.flush(timeout=2)
+
+        scope = new_scope.return_value.__enter__.return_value
+        scope.set_user.assert_called_once_with({"id": "uid"})
+        scope.set_tag.assert_called_once_with("stage", "test")
+        scope.set_extra.assert_called_once_with("body", {})
+        capture_exception.assert_called_once_with(error)
+
+    def test_rate_limit(self, init, capture_exception, flush):
+        reporter = SentryReporter(dsn="dsn", rate_limit=2)
+
+        results = [reporter.report(raise_error()) for _ in range(5)]
+        reporter.flush(timeout=2)
+
+        self.assertEqual(results, [True, True, False, False, False])
+        self.assertEqual((reporter.queued, reporter.dropped), (2, 3))
+        self.assertEqual(capture_exception.call_count, 2)
+
+    def test_bounded_queue(self, init, capture_exception, flush):
+        release = threading.Event()
+        capture_exception.side_effect = lambda *args, **kwargs: release.wait(2)
+        reporter = SentryReporter(dsn="dsn", max_queue_size=1, rate_limit=10)
+
+        # The first report is taken by the worker, the second one waits in the
+        # queue and the third one is dropped
+        reporter.report(raise_error())
+        while not capture_exception.called:
+            time.sleep(0.001)
+        self.assertTrue(reporter.report(raise_error()))
+        self.assertFalse(reporter.report(raise_error()))
+
+        self.assertFalse(reporter.flush(timeout=0.05))
+        release.set()
+        self.assertTrue(reporter.flush(timeout=2))
+
+    def test_flush_timeout(self, init, capture_exception, flush):
+        with patch("pyverless.utils.sentry.settings.SENTRY_FLUSH_TIMEOUT", 2):
+            self.assertEqual(get_flush_timeout({}), 2)
+            self.assertEqual(get_flush_timeout(LambdaContext(10000)), 2)
+            self.assertEqual(get_flush_timeout(LambdaContext(1500)), 1)
+            self.assertEqual(get_flush_timeout(LambdaContext(100)), 0)
+
+    def test_handler_500_error(self, init, capture_exception, flush):
+        class TestErrorHandler(handlers.BaseHandler):
+            def perform_action(self):
+                raise ValueError("error")
+
+        with patch.multiple(
+            "pyverless.handlers.settings", USE_SENTRY=True, STAGE="test", create=True
+        ), patch("pyverless.utils.sentry.new_scope") as new_scope:
+            response = TestErrorHandler.as_handler()({}, LambdaContext(10000))
+
+        self.assertEqual(response["statusCode"], 500)
+        capture_exception.assert_called_once()
+        scope = new_scope.return_value.__enter__.return_value
+        scope.set_tag.assert_called_once_with("stage", "test")